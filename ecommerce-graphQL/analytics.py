@@ -0,0 +1,202 @@
+import heapq
+import threading
+
+ORDER_STATUSES = ("PENDING", "PAID", "SHIPPED", "DELIVERED", "CANCELLED")
+
+# Orders in these statuses do not count towards revenue or units sold
+EXCLUDED_STATUSES = frozenset({"CANCELLED"})
+
+# created_at is an ISO timestamp, so a bucket key is just a prefix of it
+BUCKET_PREFIX = {"hourly": 13, "daily": 10}
+
+
+class SalesAnalytics:
+    """Running sales aggregates kept up to date by the order mutations
+
+    Creating an order or changing its status updates every aggregate in
+    O(1). ``rebuild()`` recomputes everything from a full order list with
+    vectorized NumPy aggregation. It reads the orders without a lock and
+    swaps the results in at the end, so the caller must keep orders from
+    being added or changing status while it runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.status_counts = {}
+        self.category_totals = {}  # category -> [orders, units, revenue]
+        self.product_totals = {}  # product id -> [units, revenue]
+        self.product_names = {}
+        self.buckets = {granularity: {} for granularity in BUCKET_PREFIX}
+
+    def _apply(self, order, category, sign):
+        units = sign * order["quantity"]
+        revenue = sign * order["total_price"]
+
+        totals = self.category_totals.setdefault(category, [0, 0, 0])
+        totals[0] += sign
+        totals[1] += units
+        totals[2] += revenue
+
+        totals = self.product_totals.setdefault(order["product_id"], [0, 0])
+        totals[0] += units
+        totals[1] += revenue
+        self.product_names[order["product_id"]] = order["product_name"]
+
+        for granularity, prefix in BUCKET_PREFIX.items():
+            bucket = self.buckets[granularity].setdefault(order["created_at"][:prefix], [0, 0, 0])
+            bucket[0] += sign
+            bucket[1] += units
+            bucket[2] += revenue
+
+    def record_order(self, order, category):
+        with self._lock:
+            status = order["status"]
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            if status not in EXCLUDED_STATUSES:
+                self._apply(order, category, 1)
+
+    def record_status_change(self, order, category, old_status):
+        with self._lock:
+            new_status = order["status"]
+            self.status_counts[old_status] -= 1
+            self.status_counts[new_status] = self.status_counts.get(new_status, 0) + 1
+            was_counted = old_status not in EXCLUDED_STATUSES
+            is_counted = new_status not in EXCLUDED_STATUSES
+            if was_counted and not is_counted:
+                self._apply(order, category, -1)
+            elif is_counted and not was_counted:
+                self._apply(order, category, 1)
+
+    # == Queries ==
+
+    def revenue_by_category(self):
+        with self._lock:
+            return [
+                {"category": category, "orders": orders, "units": units, "revenue": revenue}
+                for category, (orders, units, revenue) in sorted(self.category_totals.items())
+                if orders
+            ]
+
+    def top_products(self, limit=10):
+        with self._lock:
+            top = heapq.nlargest(
+                limit, self.product_totals.items(), key=lambda item: (item[1][0], item[1][1])
+            )
+            return [
+                {
+                    "product_id": product_id,
+                    "product_name": self.product_names[product_id],
+                    "units": units,
+                    "revenue": revenue,
+                }
+                for product_id, (units, revenue) in top
+                if units > 0
+            ]
+
+    def order_counts_by_status(self):
+        with self._lock:
+            return [
+                {"status": status, "count": self.status_counts.get(status, 0)}
+                for status in ORDER_STATUSES
+            ]
+
+    def rollup(self, granularity, since=None, until=None):
+        """Buckets in time order; since/until are inclusive bucket keys"""
+        with self._lock:
+            buckets = sorted(self.buckets[granularity].items())
+        return [
+            {"bucket": key, "orders": orders, "units": units, "revenue": revenue}
+            for key, (orders, units, revenue) in buckets
+            if orders
+            and (since is None or key >= since[: len(key)])
+            and (until is None or key <= until[: len(key)])
+        ]
+
+    # == Batch rebuild ==
+
+    def rebuild(self, orders, category_of):
+        """Recompute every aggregate from the full order list
+
+        ``category_of(product_id)`` returns the category of a product.
+        Changes recorded while this runs are overwritten by the result.
+        Without NumPy installed this falls back to replaying every order.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        if not orders or np is None:
+            with self._lock:
+                self._reset()
+            for order in orders:
+                self.record_order(order, category_of(order["product_id"]))
+            return
+
+        count = len(orders)
+        quantities = np.fromiter((o["quantity"] for o in orders), dtype=np.int64, count=count)
+        revenues = np.fromiter((o["total_price"] for o in orders), dtype=np.int64, count=count)
+        product_ids, product_codes = np.unique(
+            np.array([o["product_id"] for o in orders]), return_inverse=True
+        )
+        statuses, status_codes = np.unique(
+            np.array([o["status"] for o in orders]), return_inverse=True
+        )
+
+        counted = ~np.isin(statuses, list(EXCLUDED_STATUSES))[status_codes]
+        quantities = np.where(counted, quantities, 0)
+        revenues = np.where(counted, revenues, 0)
+        ones = counted.astype(np.int64)
+
+        def group_sums(codes, size):
+            sums = np.zeros((size, 3), dtype=np.int64)
+            np.add.at(sums, codes, np.column_stack((ones, quantities, revenues)))
+            return sums
+
+        product_sums = group_sums(product_codes, len(product_ids))
+        categories, category_codes = np.unique(
+            np.array([category_of(product_id) for product_id in product_ids.tolist()]),
+            return_inverse=True,
+        )
+        category_sums = np.zeros((len(categories), 3), dtype=np.int64)
+        np.add.at(category_sums, category_codes, product_sums)
+
+        # Last name seen per product, matching what record_order would keep
+        last_index = np.zeros(len(product_ids), dtype=np.int64)
+        np.maximum.at(last_index, product_codes, np.arange(count))
+
+        buckets = {}
+        created_at = np.array([o["created_at"] for o in orders])
+        for granularity, prefix in BUCKET_PREFIX.items():
+            keys, codes = np.unique(created_at.astype(f"<U{prefix}"), return_inverse=True)
+            sums = group_sums(codes, len(keys))
+            buckets[granularity] = {
+                key: row
+                for key, row in zip(keys.tolist(), sums.tolist())
+                if row[0]
+            }
+
+        status_counts = dict(
+            zip(statuses.tolist(), np.bincount(status_codes, minlength=len(statuses)).tolist())
+        )
+
+        with self._lock:
+            self.status_counts = status_counts
+            self.category_totals = {
+                category: row
+                for category, row in zip(categories.tolist(), category_sums.tolist())
+                if row[0]
+            }
+            self.product_totals = {
+                product_id: row[1:]
+                for product_id, row in zip(product_ids.tolist(), product_sums.tolist())
+                if row[0]
+            }
+            self.product_names = {
+                product_id: orders[index]["product_name"]
+                for product_id, index in zip(product_ids.tolist(), last_index.tolist())
+            }
+            self.buckets = buckets
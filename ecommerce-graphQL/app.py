@@ -1,11 +1,30 @@
 from flask import Flask, request, jsonify
 import graphene
 from graphene import Schema
+from graphql import ExecutionResult, execute
 from datetime import datetime
+from inspect import isawaitable
+import asyncio
+import atexit
 import json
+import os
+import threading
+
+from query_cache import PersistedQueryMismatch, PersistedQueryNotFound, QueryCache
+from analytics import ORDER_STATUSES, SalesAnalytics
+from dataloader import DataLoader, selects_field
+from inventory import OrderIdGenerator, StockReservations
+from order_index import OrderIndex
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, paginate
+from product_store import ProductStore
+from query_cost import QueryCostAnalyzer
+from result_cache import ResultCache, StoreVersions
+from search_index import SearchIndex
+from storage import create_storage
+from tracing import FieldLatencyHistograms, Tracer, should_trace
 
 # ===== DATA MODELS =====
-products_db = [
+SEED_PRODUCTS = [
     {
         "id": "1",
         "name": "Laptop Gaming ASUS ROG",
@@ -32,8 +51,81 @@ products_db = [
     },
 ]
 
-orders_db = []
-order_counter = 1
+# Set ECOMMERCE_DB_PATH to keep products and orders in SQLite across
+# restarts, otherwise everything lives in memory
+storage = create_storage(os.environ.get("ECOMMERCE_DB_PATH"), SEED_PRODUCTS)
+seed_products, orders_db = storage.load()
+# Products are kept in columns, readers get lightweight row views
+products_db = ProductStore(seed_products)
+products_by_id = products_db.by_id
+del seed_products
+orders_by_id = {o["id"]: o for o in orders_db}
+atexit.register(storage.close)
+
+# Stock is reserved under per-product locks and order ids come from a
+# lock-free sequence, so concurrent requests cannot oversell or reuse ids
+reservations = StockReservations()
+order_ids = OrderIdGenerator(start=max((int(o["id"]) for o in orders_db), default=0) + 1)
+catalog_lock = threading.Lock()
+order_status_lock = threading.Lock()
+# Appends to orders_db and order_index happen together under this lock,
+# so index positions always match list positions
+order_log_lock = threading.Lock()
+
+# Order positions per status and customer for filtered ordersConnection pages
+order_index = OrderIndex(orders_db)
+
+# Keyword and price index for searchProducts, kept in sync by the mutations
+search_index = SearchIndex(products_db)
+
+# Bumped by every mutation that changes a store, invalidates cached results
+store_versions = StoreVersions("products", "orders")
+
+# Sales aggregates, rebuilt from the loaded order log and then kept
+# up to date by the order mutations
+analytics = SalesAnalytics()
+
+
+def rebuild_analytics():
+    """Recompute the sales aggregates from orders_db, safe while serving
+
+    New orders and status changes wait until the rebuild is done, so none
+    of them is lost when the rebuilt aggregates are swapped in. Run it at
+    startup or from a periodic job to correct any drift.
+    """
+    with order_status_lock, order_log_lock:
+        analytics.rebuild(orders_db, lambda product_id: products_by_id[product_id]["category"])
+
+
+rebuild_analytics()
+
+
+def publish_orders(new_orders):
+    """Count new orders in analytics, then make them visible to readers"""
+    with order_log_lock:
+        for order in new_orders:
+            # Counted before the order is published, so a status change can
+            # never reach an order that analytics has not seen yet
+            analytics.record_order(order, products_by_id[order["product_id"]]["category"])
+            orders_db.append(order)
+            order_index.add(len(orders_db) - 1, order)
+            orders_by_id[order["id"]] = order
+
+
+def load_products(ids):
+    """Batch function for the product loader: one indexed store lookup"""
+    return [products_by_id.get(product_id) for product_id in ids]
+
+
+def create_context():
+    """Per-request context holding the request's DataLoaders"""
+    return {"product_loader": DataLoader(load_products)}
+
+
+def prime_order_products(info, orders):
+    # Queue every product id up front so Order.product resolves in one batch
+    if selects_field(info, "product"):
+        info.context["product_loader"].prime_keys(o["product_id"] for o in orders)
 
 
 # == GRAPHQL Types ==
@@ -60,6 +152,86 @@ class Order(graphene.ObjectType):
     status = graphene.String()
     created_at = graphene.String()
 
+    # Live product, batched per request through the product loader
+    product = graphene.Field(Product)
+
+    def resolve_product(self, info):
+        return info.context["product_loader"].load(self["product_id"])
+
+
+class CategoryRevenue(graphene.ObjectType):
+    """Sales totals for one category"""
+
+    category = graphene.String()
+    orders = graphene.Int()
+    units = graphene.Int()
+    revenue = graphene.Float()
+
+
+class ProductSales(graphene.ObjectType):
+    """Sales totals for one product"""
+
+    product_id = graphene.String()
+    product_name = graphene.String()
+    units = graphene.Int()
+    revenue = graphene.Float()
+
+
+class StatusCount(graphene.ObjectType):
+    """Number of orders in one status"""
+
+    status = graphene.String()
+    count = graphene.Int()
+
+
+class SalesBucket(graphene.ObjectType):
+    """Sales totals for one hour or day"""
+
+    bucket = graphene.String()
+    orders = graphene.Int()
+    units = graphene.Int()
+    revenue = graphene.Float()
+
+
+class RollupGranularity(graphene.Enum):
+    """Size of the time buckets in salesRollup"""
+
+    HOURLY = "hourly"
+    DAILY = "daily"
+
+
+class ProductConnection(graphene.relay.Connection):
+    """Cursor-paginated list of products"""
+
+    class Meta:
+        node = Product
+
+
+class OrderConnection(graphene.relay.Connection):
+    """Cursor-paginated list of orders"""
+
+    class Meta:
+        node = Order
+
+
+class OrderOrderBy(graphene.Enum):
+    """Sort order for orders"""
+
+    CREATED_AT_ASC = "created_at_asc"
+    CREATED_AT_DESC = "created_at_desc"
+
+
+def build_connection(connection_type, edges, has_next_page, after):
+    return connection_type(
+        edges=[connection_type.Edge(node=node, cursor=cursor) for cursor, node in edges],
+        page_info=graphene.relay.PageInfo(
+            has_next_page=has_next_page,
+            has_previous_page=after is not None,
+            start_cursor=edges[0][0] if edges else None,
+            end_cursor=edges[-1][0] if edges else None,
+        ),
+    )
+
 
 # == QUERIES ==
 class Query(graphene.ObjectType):
@@ -79,6 +251,32 @@ class Query(graphene.ObjectType):
     # Get all orders
     all_orders = graphene.List(Order)
 
+    # Paginated products
+    products_connection = graphene.Field(
+        ProductConnection, first=graphene.Int(), after=graphene.String()
+    )
+
+    # Paginated orders, optionally filtered
+    orders_connection = graphene.Field(
+        OrderConnection,
+        first=graphene.Int(),
+        after=graphene.String(),
+        status=graphene.String(),
+        customer_name=graphene.String(),
+        order_by=OrderOrderBy(default_value=OrderOrderBy.CREATED_AT_ASC.value),
+    )
+
+    # Sales analytics, served from running aggregates
+    revenue_by_category = graphene.List(CategoryRevenue)
+    top_selling_products = graphene.List(ProductSales, limit=graphene.Int(default_value=10))
+    order_counts_by_status = graphene.List(StatusCount)
+    sales_rollup = graphene.List(
+        SalesBucket,
+        granularity=RollupGranularity(required=True),
+        since=graphene.String(),
+        until=graphene.String(),
+    )
+
     # Search products
     search_products = graphene.List(
         Product,
@@ -91,32 +289,55 @@ class Query(graphene.ObjectType):
         return products_db
 
     def resolve_product(self, info, id):
-        for product in products_db:
-            if product["id"] == id:
-                return product
-        return None
+        return products_by_id.get(id)
 
     def resolve_products_by_category(self, info, category):
-        return [p for p in products_db if p["category"].lower() == category.lower()]
+        return products_db.in_category(category)
 
     def resolve_all_orders(self, info):
+        prime_order_products(info, orders_db)
         return orders_db
 
+    def resolve_products_connection(self, info, first=None, after=None):
+        edges, has_next_page = paginate(products_db, "product", first, after)
+        return build_connection(ProductConnection, edges, has_next_page, after)
+
+    def resolve_orders_connection(
+        self,
+        info,
+        first=None,
+        after=None,
+        status=None,
+        customer_name=None,
+        order_by=OrderOrderBy.CREATED_AT_ASC.value,
+    ):
+        # Orders are appended as they are created, so list order is created_at order
+        reverse = order_by == OrderOrderBy.CREATED_AT_DESC.value
+        if status is None and customer_name is None:
+            edges, has_next_page = paginate(orders_db, "order", first, after, reverse=reverse)
+        else:
+            positions, has_next_page = order_index.page(
+                "order", first, after, status, customer_name, reverse=reverse
+            )
+            edges = [(encode_cursor("order", i), orders_db[i]) for i in positions]
+        prime_order_products(info, (order for _, order in edges))
+        return build_connection(OrderConnection, edges, has_next_page, after)
+
+    def resolve_revenue_by_category(self, info):
+        return analytics.revenue_by_category()
+
+    def resolve_top_selling_products(self, info, limit=10):
+        return analytics.top_products(max(limit, 0))
+
+    def resolve_order_counts_by_status(self, info):
+        return analytics.order_counts_by_status()
+
+    def resolve_sales_rollup(self, info, granularity, since=None, until=None):
+        return analytics.rollup(granularity.value, since, until)
+
     def resolve_search_products(self, info, keyword, min_price=None, max_price=None):
-        results = []
-        for product in products_db:
-            # Search by keyword in name or description
-            if (
-                keyword.lower() in product["name"].lower()
-                or keyword.lower() in product["description"].lower()
-            ):
-                # Filter by price range if provided
-                if min_price and product["price"] < min_price:
-                    continue
-                if max_price and product["price"] > max_price:
-                    continue
-                results.append(product)
-        return results
+        # Search by keyword in name or description, filtered by price range
+        return search_index.search(keyword, min_price, max_price)
 
 
 # == MUTATIONS ==
@@ -134,28 +355,17 @@ class CreateOrder(graphene.Mutation):
     message = graphene.String()
 
     def mutate(self, info, product_id, quantity, customer_name):
-        global order_counter
-
         # Find product
-        product = None
-        for p in products_db:
-            if p["id"] == product_id:
-                product = p
-                break
+        product = products_by_id.get(product_id)
 
         if not product:
             return CreateOrder(order=None, success=False, message="Product not found")
-
-        if product["stock"] < quantity:
-            return CreateOrder(
-                order=None,
-                success=False,
-                message=f"Insufficient stock. Available: {product['stock']}",
-            )
+        if quantity <= 0:
+            return CreateOrder(order=None, success=False, message="Quantity must be positive")
 
         # Create order
         new_order = {
-            "id": str(order_counter),
+            "id": None,
             "product_id": product_id,
             "product_name": product["name"],
             "quantity": quantity,
@@ -165,18 +375,68 @@ class CreateOrder(graphene.Mutation):
             "created_at": datetime.now().isoformat(),
         }
 
-        # Update stock
-        product["stock"] -= quantity
+        def save_order(product):
+            # Runs under the product lock so the journal sees stock changes in
+            # order; publishing takes global locks and happens after release
+            new_order["id"] = order_ids.next_id()
+            storage.record_order(new_order)
 
-        # Save order
-        orders_db.append(new_order)
-        order_counter += 1
+        # Check and update stock atomically
+        reserved, available = reservations.reserve(product, quantity, save_order)
+        if not reserved:
+            return CreateOrder(
+                order=None,
+                success=False,
+                message=f"Insufficient stock. Available: {available}",
+            )
+        publish_orders([new_order])
+        storage.sync()
+        store_versions.bump("products", "orders")
 
         return CreateOrder(
             order=new_order, success=True, message="Order created successfully"
         )
 
 
+class UpdateOrderStatus(graphene.Mutation):
+    """Mutation for update order status"""
+
+    class Arguments:
+        order_id = graphene.String(required=True)
+        status = graphene.String(required=True)
+
+    order = graphene.Field(Order)
+    success = graphene.Boolean()
+    message = graphene.String()
+
+    def mutate(self, info, order_id, status):
+        if status not in ORDER_STATUSES:
+            return UpdateOrderStatus(
+                order=None,
+                success=False,
+                message=f"Invalid status. Expected one of: {', '.join(ORDER_STATUSES)}",
+            )
+
+        order = orders_by_id.get(order_id)
+        if order is None:
+            return UpdateOrderStatus(order=None, success=False, message="Order not found")
+
+        with order_status_lock:
+            old_status = order["status"]
+            order["status"] = status
+            storage.record_order(order)
+            if old_status != status:
+                order_index.change_status(order, old_status)
+                category = products_by_id[order["product_id"]]["category"]
+                analytics.record_status_change(order, category, old_status)
+        storage.sync()
+        store_versions.bump("orders")
+
+        return UpdateOrderStatus(
+            order=order, success=True, message="Order status updated successfully"
+        )
+
+
 class UpdateProductStock(graphene.Mutation):
     """Mutation for update stock product"""
 
@@ -189,15 +449,21 @@ class UpdateProductStock(graphene.Mutation):
     message = graphene.String()
 
     def mutate(self, info, product_id, new_stock):
-        for product in products_db:
-            if product["id"] == product_id:
-                product["stock"] = new_stock
-                return UpdateProductStock(
-                    product=product, success=True, message="Stock updated successfully"
-                )
+        product = products_by_id.get(product_id)
+        if product is None:
+            return UpdateProductStock(
+                product=None, success=False, message="Product not found"
+            )
+        if new_stock < 0:
+            return UpdateProductStock(
+                product=None, success=False, message="Stock cannot be negative"
+            )
 
+        reservations.set_stock(product, new_stock, storage.record_stock)
+        storage.sync()
+        store_versions.bump("products")
         return UpdateProductStock(
-            product=None, success=False, message="Product not found"
+            product=product, success=True, message="Stock updated successfully"
         )
 
 
@@ -215,24 +481,249 @@ class AddProduct(graphene.Mutation):
     success = graphene.Boolean()
 
     def mutate(self, info, name, price, stock, category, description=""):
-        new_product = {
-            "id": str(len(products_db) + 1),
-            "name": name,
-            "price": price,
-            "stock": stock,
-            "category": category,
-            "description": description,
-        }
-        products_db.append(new_product)
+        with catalog_lock:
+            new_product = {
+                "id": str(len(products_db) + 1),
+                "name": name,
+                "price": price,
+                "stock": stock,
+                "category": category,
+                "description": description,
+            }
+            product = products_db.append(new_product)
+            search_index.add(product)
+            storage.record_product(new_product)
+        storage.sync()
+        store_versions.bump("products")
+
+        return AddProduct(product=product, success=True)
+
+
+class OrderLineInput(graphene.InputObjectType):
+    """One line of a multi-line order"""
+
+    product_id = graphene.String(required=True)
+    quantity = graphene.Int(required=True)
+
+
+class StockUpdateInput(graphene.InputObjectType):
+    """New stock for one product"""
+
+    product_id = graphene.String(required=True)
+    new_stock = graphene.Int(required=True)
+
+
+class OrderLineResult(graphene.ObjectType):
+    """Outcome of one line of createOrders"""
+
+    product_id = graphene.String()
+    quantity = graphene.Int()
+    success = graphene.Boolean()
+    message = graphene.String()
+    order = graphene.Field(Order)
+
+
+class StockUpdateResult(graphene.ObjectType):
+    """Outcome of one update of bulkUpdateProductStock"""
+
+    product_id = graphene.String()
+    success = graphene.Boolean()
+    message = graphene.String()
+    product = graphene.Field(Product)
+
+
+# Largest number of lines accepted by one bulk mutation
+MAX_BULK_LINES = int(os.environ.get("GRAPHQL_MAX_BULK_LINES", 1000))
+
+NOT_APPLIED = "Not applied: another line failed"
+
+
+def _bulk_size_error(count):
+    if count == 0:
+        return "No lines given"
+    if count > MAX_BULK_LINES:
+        return f"{count} lines exceed the limit of {MAX_BULK_LINES}"
+    return None
+
 
-        return AddProduct(product=new_product, success=True)
+class CreateOrders(graphene.Mutation):
+    """Mutation for create one order per line, all or nothing"""
+
+    class Arguments:
+        lines = graphene.List(graphene.NonNull(OrderLineInput), required=True)
+        customer_name = graphene.String(required=True)
+
+    results = graphene.List(OrderLineResult)
+    orders = graphene.List(Order)
+    success = graphene.Boolean()
+    message = graphene.String()
+
+    def mutate(self, info, lines, customer_name):
+        error = _bulk_size_error(len(lines))
+        if error:
+            return CreateOrders(results=[], orders=[], success=False, message=error)
+
+        # Validate every line before touching any stock
+        results = []
+        valid = True
+        for line in lines:
+            result = {
+                "product_id": line.product_id,
+                "quantity": line.quantity,
+                "success": True,
+                "message": None,
+                "order": None,
+            }
+            if line.product_id not in products_by_id:
+                result.update(success=False, message="Product not found")
+            elif line.quantity <= 0:
+                result.update(success=False, message="Quantity must be positive")
+            valid = valid and result["success"]
+            results.append(result)
+
+        if not valid:
+            for result in results:
+                if result["success"]:
+                    result.update(success=False, message=NOT_APPLIED)
+            return CreateOrders(
+                results=results, orders=[], success=False, message="Validation failed"
+            )
+
+        created_at = datetime.now().isoformat()
+        new_orders = []
+        for line in lines:
+            product = products_by_id[line.product_id]
+            new_orders.append(
+                {
+                    "id": None,
+                    "product_id": line.product_id,
+                    "product_name": product["name"],
+                    "quantity": line.quantity,
+                    "total_price": product["price"] * line.quantity,
+                    "customer_name": customer_name,
+                    "status": "PENDING",
+                    "created_at": created_at,
+                }
+            )
+
+        def save_orders(products):
+            # Runs with every product lock held, like save_order in CreateOrder
+            for order in new_orders:
+                order["id"] = order_ids.next_id()
+                storage.record_order(order)
+
+        # Reserve stock for all lines at once
+        reserved, short = reservations.reserve_many(
+            [(products_by_id[line.product_id], line.quantity) for line in lines],
+            save_orders,
+        )
+        if not reserved:
+            requested = {}
+            line_counts = {}
+            for line in lines:
+                requested[line.product_id] = requested.get(line.product_id, 0) + line.quantity
+                line_counts[line.product_id] = line_counts.get(line.product_id, 0) + 1
+            for result in results:
+                product_id = result["product_id"]
+                available = short.get(product_id)
+                if available is None:
+                    result.update(success=False, message=NOT_APPLIED)
+                elif line_counts[product_id] > 1:
+                    # Lines of the same product are reserved together
+                    result.update(
+                        success=False,
+                        message=(
+                            f"Insufficient stock for the combined quantity "
+                            f"{requested[product_id]} of {line_counts[product_id]} lines. "
+                            f"Available: {available}"
+                        ),
+                    )
+                else:
+                    result.update(
+                        success=False,
+                        message=f"Insufficient stock. Available: {available}",
+                    )
+            return CreateOrders(
+                results=results, orders=[], success=False, message="Insufficient stock"
+            )
+
+        publish_orders(new_orders)
+        storage.sync()
+        store_versions.bump("products", "orders")
+
+        prime_order_products(info, new_orders)
+        for result, order in zip(results, new_orders):
+            result["order"] = order
+        return CreateOrders(
+            results=results,
+            orders=new_orders,
+            success=True,
+            message=f"{len(new_orders)} orders created successfully",
+        )
+
+
+class BulkUpdateProductStock(graphene.Mutation):
+    """Mutation for update stock of many products, all or nothing"""
+
+    class Arguments:
+        updates = graphene.List(graphene.NonNull(StockUpdateInput), required=True)
+
+    results = graphene.List(StockUpdateResult)
+    success = graphene.Boolean()
+    message = graphene.String()
+
+    def mutate(self, info, updates):
+        error = _bulk_size_error(len(updates))
+        if error:
+            return BulkUpdateProductStock(results=[], success=False, message=error)
+
+        results = []
+        valid = True
+        for update in updates:
+            product = products_by_id.get(update.product_id)
+            result = {
+                "product_id": update.product_id,
+                "success": True,
+                "message": "Stock updated successfully",
+                "product": product,
+            }
+            if product is None:
+                result.update(success=False, message="Product not found")
+            elif update.new_stock < 0:
+                result.update(success=False, message="Stock cannot be negative")
+            valid = valid and result["success"]
+            results.append(result)
+
+        if not valid:
+            for result in results:
+                if result["success"]:
+                    result.update(success=False, message=NOT_APPLIED)
+            return BulkUpdateProductStock(
+                results=results, success=False, message="Validation failed"
+            )
+
+        reservations.set_stock_many(
+            [(products_by_id[u.product_id], u.new_stock) for u in updates],
+            storage.record_stock,
+        )
+        storage.sync()
+        store_versions.bump("products")
+
+        return BulkUpdateProductStock(
+            results=results,
+            success=True,
+            message=f"{len(updates)} stock updates applied",
+        )
 
 
 class Mutation(graphene.ObjectType):
     """Root Mutation"""
 
     create_order = CreateOrder.Field()
+    create_orders = CreateOrders.Field()
+    update_order_status = UpdateOrderStatus.Field()
     update_product_stock = UpdateProductStock.Field()
+    bulk_update_product_stock = BulkUpdateProductStock.Field()
     add_product = AddProduct.Field()
 
 
@@ -244,6 +735,339 @@ app.debug = True
 schema = graphene.Schema(query=Query, mutation=Mutation)
 
 
+# Cache of parsed and validated documents, shared by every request
+query_cache = QueryCache(schema.graphql_schema, maxsize=512)
+
+
+def _page_size(args):
+    first = args.get("first")
+    if not isinstance(first, int):
+        return DEFAULT_PAGE_SIZE
+    return min(max(first, 0), MAX_PAGE_SIZE)
+
+
+def _orders_page_size(args):
+    size = _page_size(args)
+    status = args.get("status")
+    customer_name = args.get("customerName")
+    if status is None and customer_name is None:
+        return size
+    if not isinstance(status, (str, type(None))) or not isinstance(
+        customer_name, (str, type(None))
+    ):
+        return len(orders_db)
+    # A filtered page only reads the index entries it returns
+    return min(size, order_index.count(status, customer_name))
+
+
+def _category_size(args):
+    category = args.get("category")
+    if not isinstance(category, str):
+        return len(products_db)
+    return products_db.count_in_category(category)
+
+
+def _search_size(args):
+    keyword = args.get("keyword")
+    if not isinstance(keyword, str):
+        return len(products_db)
+    return search_index.estimate(keyword, args.get("minPrice"), args.get("maxPrice"))
+
+
+# Limits checked before execution; list sizes follow the live store so
+# unpaginated lists get more expensive as the catalogue grows, filtered
+# lists are sized by their category, order index or search index counts
+cost_analyzer = QueryCostAnalyzer(
+    schema.graphql_schema,
+    field_costs={"Query.searchProducts": 5},
+    list_sizes={
+        "Query.allProducts": lambda args: len(products_db),
+        "Query.productsByCategory": _category_size,
+        "Query.searchProducts": _search_size,
+        "Query.allOrders": lambda args: len(orders_db),
+        "Query.productsConnection": _page_size,
+        "Query.ordersConnection": _orders_page_size,
+        "Query.topSellingProducts": lambda args: args.get("limit") or 10,
+        "ProductConnection.edges": 1,
+        "OrderConnection.edges": 1,
+    },
+    max_depth=int(os.environ.get("GRAPHQL_MAX_DEPTH", 10)),
+    max_aliases=int(os.environ.get("GRAPHQL_MAX_ALIASES", 20)),
+    max_cost=int(os.environ.get("GRAPHQL_MAX_COST", 50000)),
+)
+
+
+# Results of read-only queries, keyed by document, variables and the
+# versions of the stores they read
+result_cache = ResultCache(
+    schema.graphql_schema,
+    store_versions,
+    type_stores={
+        "Product": "products",
+        "Order": "orders",
+        "CategoryRevenue": "orders",
+        "ProductSales": "orders",
+        "StatusCount": "orders",
+        "SalesBucket": "orders",
+    },
+    hints={
+        # Full order dumps grow without limit, don't pin them in memory
+        "Query.allOrders": 0,
+    },
+    maxsize=1024,
+)
+
+
+def prepare_operation(query, variables=None, operation_name=None, tracer=None):
+    """Parse, validate and cost-check a query
+
+    Returns ``(document, extensions, errors)``; the document must not be
+    executed when errors is non-empty.
+    """
+    document, errors = query_cache.get_document(query, tracer)
+    if errors:
+        return None, None, errors
+
+    cost = cost_analyzer.analyze(document, variables, operation_name)
+    return document, cost_analyzer.extensions(cost), cost_analyzer.check(cost)
+
+
+def _run_operation(document, variables, operation_name, context, middleware=None):
+    return execute(
+        schema.graphql_schema,
+        document,
+        context_value=context if context is not None else create_context(),
+        variable_values=variables,
+        operation_name=operation_name,
+        middleware=middleware,
+    )
+
+
+async def _await_result(result):
+    return await result
+
+
+def _with_tracing(result, tracer):
+    if tracer is None:
+        return result
+    # Cached results are shared between requests, so copy instead of mutating
+    extensions = {**(result.extensions or {}), "tracing": tracer.finish()}
+    return ExecutionResult(data=result.data, errors=result.errors, extensions=extensions)
+
+
+def _with_tracer(middleware, tracer):
+    if tracer is None:
+        return middleware
+    # Last middleware is outermost, so the timing covers the others too
+    return [*(middleware or ()), tracer]
+
+
+def execute_operation(query, variables=None, operation_name=None, context=None, tracer=None):
+    """Execute a query using the parsed-document cache and cost limits"""
+    document, extensions, errors = prepare_operation(query, variables, operation_name, tracer)
+    if errors:
+        result = ExecutionResult(data=None, errors=errors, extensions=extensions)
+        return _with_tracing(result, tracer)
+
+    key, max_age = result_cache.key(document, variables, operation_name)
+    if key is not None:
+        cached = result_cache.get(key)
+        if cached is not None:
+            return _with_tracing(cached, tracer)
+
+    result = _run_operation(
+        document, variables, operation_name, context, _with_tracer(None, tracer)
+    )
+    if isawaitable(result):
+        # A coroutine resolver was hit, finish it on a private event loop
+        result = asyncio.run(_await_result(result))
+    result.extensions = extensions
+    if key is not None and not result.errors:
+        result_cache.set(key, result, max_age)
+    return _with_tracing(result, tracer)
+
+
+async def execute_operation_async(
+    query, variables=None, operation_name=None, context=None, middleware=None, tracer=None
+):
+    """Async version of execute_operation for the ASGI server
+
+    Coroutine resolvers are awaited on the running loop, and independent
+    root query fields that return awaitables are resolved concurrently.
+    """
+    document, extensions, errors = prepare_operation(query, variables, operation_name, tracer)
+    if errors:
+        result = ExecutionResult(data=None, errors=errors, extensions=extensions)
+        return _with_tracing(result, tracer)
+
+    key, max_age = result_cache.key(document, variables, operation_name)
+    if key is not None:
+        cached = result_cache.get(key)
+        if cached is not None:
+            return _with_tracing(cached, tracer)
+
+    result = _run_operation(
+        document, variables, operation_name, context, _with_tracer(middleware, tracer)
+    )
+    if isawaitable(result):
+        result = await result
+    result.extensions = extensions
+    if key is not None and not result.errors:
+        result_cache.set(key, result, max_age)
+    return _with_tracing(result, tracer)
+
+
+def format_result(result):
+    """Response body for an execution result"""
+    response_data = {"data": result.data}
+
+    if result.errors:
+        response_data["errors"] = [str(error) for error in result.errors]
+
+    if result.extensions:
+        response_data["extensions"] = result.extensions
+
+    return response_data
+
+
+def _load_json_arg(value):
+    """Decode a JSON-encoded GET argument, returning None if invalid"""
+    if value and isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
+
+
+def apply_persisted_query(query, extensions):
+    """Resolve automatic persisted queries, the client may send only the hash
+
+    Returns ``(query, error)`` where error is a response body to send back
+    instead of executing anything.
+    """
+    persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+    if not persisted or not persisted.get("sha256Hash"):
+        return query, None
+
+    try:
+        return query_cache.resolve_persisted(query, persisted["sha256Hash"]), None
+    except PersistedQueryNotFound as e:
+        code = "PERSISTED_QUERY_NOT_FOUND"
+        message = str(e)
+    except PersistedQueryMismatch as e:
+        code = "BAD_REQUEST"
+        message = str(e)
+    # Apollo clients look for this exact message to resend the full query
+    return None, {"errors": [{"message": message, "extensions": {"code": code}}]}
+
+
+# Most operations accepted in one batched POST (a JSON array of requests)
+MAX_BATCH_SIZE = int(os.environ.get("GRAPHQL_MAX_BATCH_SIZE", 10))
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Fraction of requests traced without the client asking for it, 0 disables
+TRACE_SAMPLE_RATE = float(os.environ.get("GRAPHQL_TRACE_SAMPLE_RATE", 0))
+field_histograms = FieldLatencyHistograms()
+
+
+def _request_tracer(data):
+    if should_trace(data.get("extensions"), TRACE_SAMPLE_RATE):
+        return Tracer(field_histograms)
+    return None
+
+
+def _request_query(data):
+    """Query text of one request body, or a (status, body) error response"""
+    if not isinstance(data, dict):
+        return None, (400, {"error": "No query provided"})
+    query, error = apply_persisted_query(data.get("query"), data.get("extensions"))
+    if error:
+        return None, (200, error)
+    if not query:
+        return None, (400, {"error": "No query provided"})
+    return query, None
+
+
+def execute_request(data, context=None):
+    """Run one request body (query, variables, operationName, extensions)
+
+    Returns ``(status, response body)``. Failures stay inside the returned
+    body, so one bad operation in a batch does not affect the others.
+    """
+    query, error = _request_query(data)
+    if error:
+        return error
+
+    try:
+        result = execute_operation(
+            query,
+            _load_json_arg(data.get("variables")),
+            data.get("operationName"),
+            context,
+            _request_tracer(data),
+        )
+    except Exception as e:
+        return 500, {"error": str(e)}
+    return 200, format_result(result)
+
+
+async def execute_request_async(data, context=None, middleware=None):
+    """Async version of execute_request for the ASGI server"""
+    query, error = _request_query(data)
+    if error:
+        return error
+
+    try:
+        result = await execute_operation_async(
+            query,
+            _load_json_arg(data.get("variables")),
+            data.get("operationName"),
+            context,
+            middleware,
+            _request_tracer(data),
+        )
+    except Exception as e:
+        return 500, {"error": str(e)}
+    return 200, format_result(result)
+
+
+def check_batch(operations):
+    """Error response body for a batch that must not run, else None"""
+    if not operations:
+        return {"error": "Empty batch"}
+    if len(operations) > MAX_BATCH_SIZE:
+        return {
+            "error": f"Batch of {len(operations)} operations exceeds "
+            f"the limit of {MAX_BATCH_SIZE}"
+        }
+    return None
+
+
+def execute_batch(operations):
+    """Run batched operations in order with one shared context
+
+    Sharing the context lets the DataLoaders dedupe lookups across the
+    whole batch. Returns one response body per operation.
+    """
+    context = create_context()
+    return [execute_request(data, context)[1] for data in operations]
+
+
+async def execute_batch_async(operations, middleware=None):
+    context = create_context()
+    results = []
+    for data in operations:
+        status, body = await execute_request_async(data, context, middleware)
+        results.append(body)
+    return results
+
+
+def endpoint_stats():
+    return {"query_cache": query_cache.stats(), "result_cache": result_cache.stats()}
+
+
 # Custom GraphQL endpoint handler
 @app.route("/graphql", methods=["GET", "POST", "OPTIONS"])
 def graphql_server():
@@ -257,41 +1081,44 @@ def graphql_server():
 
     # Get query from request
     if request.method == "GET":
-        query = request.args.get("query")
-        variables = request.args.get("variables")
+        data = {
+            "query": request.args.get("query"),
+            "variables": request.args.get("variables"),
+            "operationName": request.args.get("operationName"),
+            "extensions": _load_json_arg(request.args.get("extensions")),
+        }
+        if not data["query"] and not data["extensions"]:
+            # Return GraphiQL interface for GET requests without query
+            return GRAPHIQL_HTML, 200, {"Content-Type": "text/html"}
     else:
         data = request.get_json()
-        query = data.get("query") if data else None
-        variables = data.get("variables") if data else None
-
-    if not query:
-        # Return GraphiQL interface for GET requests without query
-        if request.method == "GET":
-            return GRAPHIQL_HTML, 200, {"Content-Type": "text/html"}
-        return jsonify({"error": "No query provided"}), 400
 
-    # Parse variables if string
-    if variables and isinstance(variables, str):
-        try:
-            variables = json.loads(variables)
-        except:
-            variables = None
+    # Batched operations: a JSON array of requests answered with an array
+    if isinstance(data, list):
+        error = check_batch(data)
+        if error:
+            status, body = 400, error
+        else:
+            status, body = 200, execute_batch(data)
+    else:
+        status, body = execute_request(data)
 
-    # Execute query
-    try:
-        result = schema.execute(query, variable_values=variables)
+    response = jsonify(body)
+    response.status_code = status
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
 
-        response_data = {"data": result.data}
 
-        if result.errors:
-            response_data["errors"] = [str(error) for error in result.errors]
+@app.route("/graphql/stats")
+def graphql_stats():
+    """Cache metrics for the GraphQL endpoint"""
+    return jsonify(endpoint_stats())
 
-        response = jsonify(response_data)
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        return response
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+@app.route("/metrics")
+def metrics():
+    """Resolver latency histograms in Prometheus text format"""
+    return field_histograms.render_prometheus(), 200, {"Content-Type": PROMETHEUS_CONTENT_TYPE}
 
 
 # GraphiQL HTML interface
@@ -351,12 +1178,19 @@ def index():
         <li>productsByCategory(category) - Get products by category</li>
         <li>searchProducts(keyword, minPrice, maxPrice) - Search products</li>
         <li>allOrders - Get all orders</li>
+        <li>revenueByCategory, topSellingProducts(limit), orderCountsByStatus - Sales analytics</li>
+        <li>salesRollup(granularity, since, until) - Hourly or daily sales</li>
+        <li>productsConnection(first, after) - Paginated products</li>
+        <li>ordersConnection(first, after, status, customerName, orderBy) - Paginated orders</li>
     </ul>
     <h3>Available Mutations:</h3>
     <ul>
         <li>createOrder - Create new order</li>
+        <li>updateOrderStatus - Change the status of an order</li>
         <li>updateProductStock - Update product stock</li>
         <li>addProduct - Add new product</li>
+        <li>createOrders(lines, customerName) - Create several orders at once</li>
+        <li>bulkUpdateProductStock(updates) - Update stock of many products</li>
     </ul>
     """
 
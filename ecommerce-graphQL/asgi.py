@@ -0,0 +1,142 @@
+"""ASGI entry point for the GraphQL e-commerce API
+
+Serves the same schema as the Flask app in app.py with async execution,
+so a request waiting on a coroutine resolver does not hold an OS thread.
+Run it with any ASGI server, for example:
+
+    uvicorn asgi:app --port 8000
+"""
+import asyncio
+import functools
+import json
+from urllib.parse import parse_qs
+
+from app import (
+    GRAPHIQL_HTML,
+    PROMETHEUS_CONTENT_TYPE,
+    _load_json_arg,
+    check_batch,
+    endpoint_stats,
+    execute_batch_async,
+    execute_request_async,
+    field_histograms,
+    storage,
+)
+
+CORS_HEADERS = [(b"access-control-allow-origin", b"*")]
+
+
+def run_mutations_in_threads(next_, root, info, **args):
+    """Run mutation resolvers in the default executor
+
+    Mutations take stock locks and wait for the storage journal to sync,
+    which would otherwise block the event loop for every other request.
+    """
+    if info.parent_type.name == "Mutation":
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, functools.partial(next_, root, info, **args))
+    return next_(root, info, **args)
+
+
+async def read_body(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def send_response(send, status, body, content_type=b"application/json", headers=()):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), *CORS_HEADERS, *headers],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def graphql_endpoint(scope, receive, send):
+    method = scope["method"]
+    if method == "OPTIONS":
+        # Handle CORS preflight
+        await send_response(
+            send,
+            200,
+            {"status": "ok"},
+            headers=[
+                (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+                (b"access-control-allow-headers", b"Content-Type"),
+            ],
+        )
+        return
+
+    # Get query from request
+    if method == "GET":
+        params = parse_qs(scope.get("query_string", b"").decode())
+        data = {key: values[0] for key, values in params.items()}
+        data["extensions"] = _load_json_arg(data.get("extensions"))
+    elif method == "POST":
+        try:
+            data = json.loads(await read_body(receive) or b"null")
+        except ValueError:
+            await send_response(send, 400, {"error": "Invalid JSON body"})
+            return
+    else:
+        await send_response(send, 405, {"error": "Method not allowed"})
+        return
+
+    # Batched operations: a JSON array of requests answered with an array
+    if isinstance(data, list):
+        error = check_batch(data)
+        if error:
+            await send_response(send, 400, error)
+            return
+        results = await execute_batch_async(data, middleware=[run_mutations_in_threads])
+        await send_response(send, 200, results)
+        return
+
+    if method == "GET" and not data.get("query") and not data.get("extensions"):
+        # Return GraphiQL interface for GET requests without query
+        await send_response(send, 200, GRAPHIQL_HTML.encode(), b"text/html")
+        return
+
+    status, body = await execute_request_async(
+        data, middleware=[run_mutations_in_threads]
+    )
+    await send_response(send, status, body)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            storage.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    path = scope["path"]
+    if path == "/graphql":
+        await graphql_endpoint(scope, receive, send)
+    elif path == "/graphql/stats":
+        await send_response(send, 200, endpoint_stats())
+    elif path == "/metrics":
+        body = field_histograms.render_prometheus().encode()
+        await send_response(send, 200, body, PROMETHEUS_CONTENT_TYPE.encode())
+    else:
+        await send_response(send, 404, {"error": "Not found"})
@@ -0,0 +1,154 @@
+"""Concurrent-request throughput: Flask (threads) vs ASGI (async)
+
+Both servers are driven in-process so the numbers compare the request
+paths rather than the HTTP servers: the Flask app through its test client
+from a thread pool, the ASGI app by calling it directly from concurrent
+tasks on one event loop.
+
+The result cache is disabled so every request executes. Besides a plain
+query and a mutation, the schema is extended with two coroutine root
+fields that wait on a simulated upstream call; ASGI resolves those
+concurrently on its loop while Flask runs each request on its own loop.
+
+    python benchmarks/bench_asgi.py --requests 5000 --concurrency 64
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import graphene  # noqa: E402
+
+import app  # noqa: E402
+import asgi  # noqa: E402
+from pagination import encode_cursor  # noqa: E402
+from query_cache import QueryCache  # noqa: E402
+
+PRODUCTS_PAGE = """
+    query($after: String) {
+      productsConnection(first: 20, after: $after) { edges { node { id name price stock } } }
+      searchProducts(keyword: "pro") { id name }
+    }
+"""
+CREATE_ORDER = """
+    mutation($customer: String!) {
+      createOrder(productId: "1", quantity: 1, customerName: $customer) { success }
+    }
+"""
+UPSTREAM = """
+    query($id: String!) {
+      shippingEstimate(productId: $id)
+      warehouseStock(productId: $id)
+    }
+"""
+
+# Simulated latency of the upstream service behind the coroutine fields
+UPSTREAM_SECONDS = 0.002
+
+
+class BenchQuery(app.Query, graphene.ObjectType):
+    """Query plus coroutine fields standing in for calls to other services"""
+
+    shipping_estimate = graphene.Int(product_id=graphene.String(required=True))
+    warehouse_stock = graphene.Int(product_id=graphene.String(required=True))
+
+    async def resolve_shipping_estimate(self, info, product_id):
+        await asyncio.sleep(UPSTREAM_SECONDS)
+        return 3
+
+    async def resolve_warehouse_stock(self, info, product_id):
+        await asyncio.sleep(UPSTREAM_SECONDS)
+        return app.products_by_id[product_id]["stock"]
+
+
+def use_bench_schema():
+    schema = graphene.Schema(query=BenchQuery, mutation=app.Mutation)
+    app.schema = schema
+    app.query_cache = QueryCache(schema.graphql_schema, maxsize=512)
+    app.cost_analyzer.schema = schema.graphql_schema
+    app.result_cache.schema = schema.graphql_schema
+    # Every request executes, nothing is answered from the result cache
+    app.result_cache.maxsize = 0
+
+
+def request_bodies(case):
+    counter = itertools.count()
+    if case == "query":
+        # Distinct variables per request, so even a live cache would miss
+        cursors = [None] + [encode_cursor("product", i) for i in range(len(app.products_db))]
+        return lambda: {
+            "query": PRODUCTS_PAGE,
+            "variables": {"after": cursors[next(counter) % len(cursors)]},
+        }
+    if case == "mutation":
+        return lambda: {"query": CREATE_ORDER, "variables": {"customer": f"bench {next(counter)}"}}
+    return lambda: {"query": UPSTREAM, "variables": {"id": "1"}}
+
+
+def bench_flask(make_body, total, concurrency):
+    client = app.app.test_client()
+
+    def one(_):
+        response = client.post("/graphql", json=make_body())
+        assert response.status_code == 200 and "errors" not in response.json, response.json
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(one, range(total)))
+        return time.perf_counter() - start
+
+
+async def call_asgi(body):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/graphql", "query_string": b""}
+    await asgi.app(scope, receive, send)
+    assert sent[0]["status"] == 200 and b'"errors"' not in sent[1]["body"], sent[1]["body"]
+
+
+async def bench_asgi(make_body, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await call_asgi(json.dumps(make_body()).encode())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    use_bench_schema()
+    app.products_by_id["1"]["stock"] = 10**9
+    for case in ("query", "mutation", "coroutine"):
+        flask_elapsed = bench_flask(request_bodies(case), args.requests, args.concurrency)
+        asgi_elapsed = asyncio.run(
+            bench_asgi(request_bodies(case), args.requests, args.concurrency)
+        )
+        for name, elapsed in (("flask", flask_elapsed), ("asgi", asgi_elapsed)):
+            print(
+                f"{case:9} {name:6} {args.requests} requests, concurrency {args.concurrency}: "
+                f"{args.requests / elapsed:8.0f} req/sec"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Bulk mutations against one call per line
+
+Compares N createOrder calls with one createOrders call of N lines, and N
+updateProductStock calls with one bulkUpdateProductStock call.
+
+    python benchmarks/bench_bulk_mutations.py --lines 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+CREATE_ORDER = """
+    mutation($productId: String!, $quantity: Int!) {
+      createOrder(productId: $productId, quantity: $quantity, customerName: "bench") {
+        success
+      }
+    }
+"""
+CREATE_ORDERS = """
+    mutation($lines: [OrderLineInput!]!) {
+      createOrders(lines: $lines, customerName: "bench") { success }
+    }
+"""
+UPDATE_STOCK = """
+    mutation($productId: String!, $newStock: Int!) {
+      updateProductStock(productId: $productId, newStock: $newStock) { success }
+    }
+"""
+BULK_UPDATE_STOCK = """
+    mutation($updates: [StockUpdateInput!]!) {
+      bulkUpdateProductStock(updates: $updates) { success }
+    }
+"""
+
+
+def reset_store(products):
+    app.products_db.clear()
+    app.products_db.extend(
+        {
+            "id": str(i + 1),
+            "name": f"Product {i + 1}",
+            "price": 1000,
+            "stock": 10**9,
+            "category": "Bench",
+            "description": "",
+        }
+        for i in range(products)
+    )
+    app.orders_db.clear()
+    app.order_index = app.OrderIndex()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(operations):
+    for query, variables in operations:
+        result = app.execute_operation(query, variables)
+        assert not result.errors, result.errors
+        assert all(field["success"] for field in result.data.values()), result.data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=500)
+    args = parser.parse_args()
+    reset_store(args.products)
+
+    product_ids = [str(i % args.products + 1) for i in range(args.lines)]
+    order_lines = [{"productId": pid, "quantity": 1} for pid in product_ids]
+    stock_updates = [{"productId": pid, "newStock": 1000} for pid in product_ids]
+
+    cases = [
+        (
+            "orders",
+            [(CREATE_ORDER, line) for line in order_lines],
+            [(CREATE_ORDERS, {"lines": order_lines})],
+        ),
+        (
+            "stock",
+            [(UPDATE_STOCK, update) for update in stock_updates],
+            [(BULK_UPDATE_STOCK, {"updates": stock_updates})],
+        ),
+    ]
+    for name, per_call, bulk in cases:
+        single = timed(lambda: run(per_call))
+        batched = timed(lambda: run(bulk))
+        print(
+            f"{name:7} {args.lines} lines  per-call {args.lines / single:9.0f} lines/sec  "
+            f"bulk {args.lines / batched:9.0f} lines/sec  ({single / batched:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Columnar ProductStore against a list of product dicts
+
+Measures memory per product (with tracemalloc, including the id index)
+and how fast the Product type resolves rows from each representation.
+
+    python benchmarks/bench_product_store.py --products 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import graphene  # noqa: E402
+from graphql import execute, parse  # noqa: E402
+
+import app  # noqa: E402
+from catalog import iter_products  # noqa: E402
+from product_store import ProductStore  # noqa: E402
+
+PAGE = parse("""
+    query($first: Int!) {
+      products(first: $first) { id name price stock category description }
+    }
+""")
+
+
+class BenchQuery(graphene.ObjectType):
+    products = graphene.List(app.Product, first=graphene.Int(required=True))
+
+    def resolve_products(self, info, first):
+        return info.context["products"][:first]
+
+
+def build_dicts(count):
+    products = list(iter_products(count))
+    return products, {p["id"]: p for p in products}
+
+
+def build_store(count):
+    store = ProductStore(iter_products(count))
+    return store, store.by_id
+
+
+def measure_memory(build, count):
+    gc.collect()
+    tracemalloc.start()
+    built = build(count)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return built, used
+
+
+def rows_per_sec(schema, products, first, repeats):
+    context = {"products": products}
+    variables = {"first": first}
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = execute(schema, PAGE, context_value=context, variable_values=variables)
+        assert not result.errors, result.errors
+    return first * repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    schema = graphene.Schema(query=BenchQuery).graphql_schema
+    for name, build in (("dicts", build_dicts), ("columnar", build_store)):
+        (products, by_id), used = measure_memory(build, args.products)
+
+        ids = [str(i) for i in range(1, args.products + 1, 7)]
+        start = time.perf_counter()
+        for product_id in ids:
+            by_id[product_id]["stock"]
+        lookups = len(ids) / (time.perf_counter() - start)
+
+        rate = rows_per_sec(schema, products, min(args.page, args.products), args.repeats)
+        print(
+            f"{name:9} {args.products} products  {used / args.products:7.1f} bytes/product  "
+            f"{rate:9.0f} rows/sec resolved  {lookups:10.0f} stock lookups/sec"
+        )
+        del products, by_id
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare schema.execute against the parsed-document and result caches
+
+Run from the ecommerce-graphQL directory:
+
+    python benchmarks/bench_query_cache.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import execute_operation, query_cache, result_cache, schema  # noqa: E402
+
+QUERIES = {
+    "allProducts": """
+        {
+          allProducts {
+            id
+            name
+            price
+            stock
+            category
+          }
+        }
+    """,
+    "searchProducts": """
+        query Search($keyword: String!, $minPrice: Int, $maxPrice: Int) {
+          searchProducts(keyword: $keyword, minPrice: $minPrice, maxPrice: $maxPrice) {
+            id
+            name
+            price
+          }
+        }
+    """,
+}
+
+VARIABLES = {
+    "allProducts": None,
+    "searchProducts": {"keyword": "laptop", "minPrice": 0, "maxPrice": 20000000},
+}
+
+
+def bench(name, number=5000):
+    query, variables = QUERIES[name], VARIABLES[name]
+
+    uncached = timeit.timeit(
+        lambda: schema.execute(query, variable_values=variables), number=number
+    )
+    # Parsed-document cache only: a zero-sized result cache never hits
+    maxsize, result_cache.maxsize = result_cache.maxsize, 0
+    execute_operation(query, variables)  # warm the document cache
+    cached = timeit.timeit(lambda: execute_operation(query, variables), number=number)
+    result_cache.maxsize = maxsize
+
+    execute_operation(query, variables)  # warm the result cache
+    results = timeit.timeit(lambda: execute_operation(query, variables), number=number)
+
+    print(
+        f"{name:15} uncached {uncached / number * 1e6:8.1f} us/op  "
+        f"document cache {cached / number * 1e6:8.1f} us/op "
+        f"({uncached / cached:5.2f}x)  "
+        f"result cache {results / number * 1e6:8.1f} us/op "
+        f"({uncached / results:6.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    for name in QUERIES:
+        bench(name)
+    print("document cache:", query_cache.stats())
+    print("result cache:", result_cache.stats())
@@ -0,0 +1,92 @@
+"""Multi-threaded stress test for CreateOrder stock reservations
+
+Many threads place orders for a few products at once. After each run the
+script checks that no product was oversold and that every order id is
+unique, then prints orders/sec for each thread count.
+
+    python benchmarks/bench_reservations.py
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+CREATE_ORDER = """
+    mutation Create($productId: String!, $quantity: Int!) {
+      createOrder(productId: $productId, quantity: $quantity, customerName: "bench") {
+        success
+        order { id }
+      }
+    }
+"""
+
+PRODUCTS = 8
+STOCK_PER_PRODUCT = 2000
+ORDERS_PER_THREAD = 1000
+
+
+def reset_store():
+    app.products_db.clear()
+    app.products_db.extend(
+        {
+            "id": str(i + 1),
+            "name": f"Product {i + 1}",
+            "price": 1000,
+            "stock": STOCK_PER_PRODUCT,
+            "category": "Bench",
+            "description": "",
+        }
+        for i in range(PRODUCTS)
+    )
+    app.orders_db.clear()
+    app.order_index = app.OrderIndex()
+    app.order_ids.reset(1)
+
+
+def worker(thread_index, barrier):
+    barrier.wait()
+    for i in range(ORDERS_PER_THREAD):
+        product_id = str((thread_index + i) % PRODUCTS + 1)
+        result = app.execute_operation(
+            CREATE_ORDER, {"productId": product_id, "quantity": 1}
+        )
+        assert not result.errors, result.errors
+
+
+def run(threads):
+    reset_store()
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(i, barrier)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # No oversell: stock never negative and sold units match the orders
+    for product in app.products_db:
+        assert product["stock"] >= 0, product
+    sold = sum(STOCK_PER_PRODUCT - p["stock"] for p in app.products_db)
+    assert sold == sum(o["quantity"] for o in app.orders_db)
+    assert sold == min(threads * ORDERS_PER_THREAD, PRODUCTS * STOCK_PER_PRODUCT)
+
+    ids = [o["id"] for o in app.orders_db]
+    assert len(ids) == len(set(ids)), "duplicate order ids"
+
+    attempts = threads * ORDERS_PER_THREAD
+    print(
+        f"threads {threads:3}  attempts {attempts:6}  orders {len(ids):6}  "
+        f"{attempts / elapsed:9.0f} mutations/sec"
+    )
+
+
+if __name__ == "__main__":
+    for threads in (1, 2, 4, 8, 16, 32):
+        run(threads)
+    print("no oversell, no duplicate order ids")
@@ -0,0 +1,115 @@
+"""Write throughput and restart time of the SQLite storage backend
+
+Writes orders through SQLiteStorage from several threads (group commit),
+then measures how long a restart takes with the orders still in the
+journal and again after compacting them into the snapshot.
+
+    python benchmarks/bench_storage.py --orders 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import SQLiteStorage  # noqa: E402
+
+PRODUCTS = [
+    {
+        "id": str(i),
+        "name": f"Product {i}",
+        "price": 1000 + i,
+        "stock": 10**9,
+        "category": "Bench",
+        "description": "",
+    }
+    for i in range(1, 101)
+]
+
+
+def write_orders(storage, products, orders, total, threads):
+    per_thread = total // threads
+    lock = threading.Lock()
+    next_id = iter(range(1, total + 1))
+
+    def worker(index):
+        for i in range(per_thread):
+            product = products[(index + i) % len(products)]
+            with lock:
+                product["stock"] -= 1
+                order = {
+                    "id": str(next(next_id)),
+                    "product_id": product["id"],
+                    "product_name": product["name"],
+                    "quantity": 1,
+                    "total_price": product["price"],
+                    "customer_name": f"customer-{i % 1000}",
+                    "status": "PENDING",
+                    "created_at": datetime.now().isoformat(),
+                }
+                orders.append(order)
+                storage.record_order(order)
+            storage.sync()
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    storage.flush()
+    return per_thread * threads, time.perf_counter() - start
+
+
+def restart(path):
+    start = time.perf_counter()
+    storage = SQLiteStorage(path, compact_every=0)
+    products, orders = storage.load()
+    elapsed = time.perf_counter() - start
+    return storage, len(orders), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument(
+        "--no-durable",
+        action="store_true",
+        help="batch journal writes instead of fsyncing on every sync()",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        storage = SQLiteStorage(
+            path, PRODUCTS, durable=not args.no_durable, compact_every=0
+        )
+        products, orders = storage.load()
+
+        written, elapsed = write_orders(storage, products, orders, args.orders, args.threads)
+        print(
+            f"write    {written} orders, {args.threads} threads: "
+            f"{written / elapsed:,.0f} orders/sec ({elapsed:.2f}s)"
+        )
+        storage._journal.close()  # simulate a crash: no compaction on exit
+
+        storage, count, elapsed = restart(path)
+        print(f"restart  journal replay of {count} orders: {elapsed:.2f}s")
+
+        start = time.perf_counter()
+        storage.compact()
+        print(f"compact  {time.perf_counter() - start:.2f}s")
+        storage.close()
+
+        storage, count, elapsed = restart(path)
+        print(f"restart  snapshot load of {count} orders: {elapsed:.2f}s")
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
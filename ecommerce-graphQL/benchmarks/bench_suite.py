@@ -0,0 +1,302 @@
+"""End-to-end benchmark suite on a synthetic catalogue
+
+Generates a catalogue and order history of the given size, then drives
+representative queries and mutations through the Flask test client (the
+full HTTP stack with caches and cost limits) and through the schema
+directly. Prints latency percentiles, throughput and peak RSS as JSON, so
+results can be saved and compared across commits. Each catalogue size
+runs in its own process, so peak RSS is per size. The query cost limit is
+off unless --max-cost is given, and the report records which was used.
+
+    python benchmarks/bench_suite.py --products 1000 100000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from catalog import generate_orders, generate_products, load_catalog  # noqa: E402
+from pagination import encode_cursor  # noqa: E402
+
+PRODUCT = """
+    query($id: String!) { product(id: $id) { id name price stock category } }
+"""
+PRODUCTS_BY_CATEGORY = """
+    query($category: String!) { productsByCategory(category: $category) { id name price } }
+"""
+SEARCH_PRODUCTS = """
+    query($keyword: String!, $maxPrice: Int) {
+      searchProducts(keyword: $keyword, maxPrice: $maxPrice) { id name price }
+    }
+"""
+PRODUCTS_PAGE = """
+    query($after: String) {
+      productsConnection(first: 20, after: $after) {
+        edges { cursor node { id name price stock } }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+"""
+ORDERS_PAGE = """
+    query($after: String, $status: String) {
+      ordersConnection(first: 20, after: $after, status: $status) {
+        edges { node { id quantity totalPrice product { name stock } } }
+        pageInfo { hasNextPage }
+      }
+    }
+"""
+SALES_DASHBOARD = """
+    {
+      revenueByCategory { category revenue }
+      topSellingProducts(limit: 10) { productName units }
+      orderCountsByStatus { status count }
+    }
+"""
+CREATE_ORDER = """
+    mutation($productId: String!) {
+      createOrder(productId: $productId, quantity: 1, customerName: "bench") { success }
+    }
+"""
+UPDATE_STOCK = """
+    mutation($productId: String!, $newStock: Int!) {
+      updateProductStock(productId: $productId, newStock: $newStock) { success }
+    }
+"""
+
+
+def random_product(rng, products):
+    return products[rng.randrange(len(products))]
+
+
+def random_cursor(rng, prefix, size):
+    return encode_cursor(prefix, rng.randrange(size)) if size else None
+
+
+# name -> (query, variables factory taking (rng, products, orders))
+SCENARIOS = {
+    "product": (PRODUCT, lambda rng, p, o: {"id": random_product(rng, p)["id"]}),
+    "products_by_category": (
+        PRODUCTS_BY_CATEGORY,
+        lambda rng, p, o: {"category": random_product(rng, p)["category"]},
+    ),
+    "search_products": (
+        SEARCH_PRODUCTS,
+        # "Gaming Laptop 123" style keywords match a handful of products
+        lambda rng, p, o: {
+            "keyword": random_product(rng, p)["name"].split(" ", 1)[1],
+            "maxPrice": rng.choice((None, 20_000_000)),
+        },
+    ),
+    "products_page": (
+        PRODUCTS_PAGE,
+        lambda rng, p, o: {"after": random_cursor(rng, "product", len(p))},
+    ),
+    "orders_page": (
+        ORDERS_PAGE,
+        lambda rng, p, o: {
+            "after": random_cursor(rng, "order", len(o)),
+            "status": rng.choice((None, "PAID")),
+        },
+    ),
+    "sales_dashboard": (SALES_DASHBOARD, lambda rng, p, o: None),
+    "create_order": (
+        CREATE_ORDER,
+        lambda rng, p, o: {"productId": random_product(rng, p)["id"]},
+    ),
+    "update_stock": (
+        UPDATE_STOCK,
+        lambda rng, p, o: {"productId": random_product(rng, p)["id"], "newStock": 1000},
+    ),
+}
+
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed):
+    latencies = sorted(latencies)
+    ms = 1000
+    return {
+        "iterations": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * ms, 4),
+        "p50_ms": round(percentile(latencies, 0.50) * ms, 4),
+        "p90_ms": round(percentile(latencies, 0.90) * ms, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * ms, 4),
+        "max_ms": round(latencies[-1] * ms, 4),
+    }
+
+
+def client_driver():
+    client = app.app.test_client()
+
+    def run(query, variables):
+        response = client.post("/graphql", json={"query": query, "variables": variables})
+        body = response.get_json()
+        assert response.status_code == 200 and "errors" not in body, body
+
+    return run
+
+
+def schema_driver():
+    def run(query, variables):
+        result = app.schema.execute(
+            query, variable_values=variables, context_value=app.create_context()
+        )
+        assert not result.errors, result.errors
+
+    return run
+
+
+DRIVERS = {"client": client_driver, "schema": schema_driver}
+
+
+def bench_scenario(run, query, make_variables, products, orders, iterations, warmup, seed):
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        run(query, make_variables(rng, products, orders))
+
+    variables = [make_variables(rng, products, orders) for _ in range(iterations)]
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    for item in variables:
+        start = clock()
+        run(query, item)
+        latencies.append(clock() - start)
+    return summarize(latencies, clock() - started)
+
+
+def run_size(args, products_count):
+    orders_count = args.orders if args.orders is not None else products_count
+    rss_before = peak_rss_bytes()
+
+    start = time.perf_counter()
+    products = generate_products(products_count, args.seed)
+    orders = generate_orders(products, orders_count, args.seed)
+    generate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load_catalog(app, products, orders)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = peak_rss_bytes()
+
+    if args.no_result_cache:
+        app.result_cache.maxsize = 0
+    # A whole category of a 1M catalogue is ~83k rows, over the default
+    # budget, so the limit is lifted unless a --max-cost is given
+    app.cost_analyzer.max_cost = args.max_cost if args.max_cost is not None else sys.maxsize
+
+    results = {}
+    for driver_name in args.drivers:
+        run = DRIVERS[driver_name]()
+        for name in args.scenarios:
+            query, make_variables = SCENARIOS[name]
+            results.setdefault(name, {})[driver_name] = bench_scenario(
+                run, query, make_variables, products, orders,
+                args.iterations, args.warmup, args.seed,
+            )
+
+    return {
+        "products": products_count,
+        "orders": orders_count,
+        "generate_seconds": round(generate_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "peak_rss_before_load_bytes": rss_before,
+        "peak_rss_after_load_bytes": rss_loaded,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "max_cost": args.max_cost,
+        "result_cache": not args.no_result_cache,
+        "scenarios": results,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def child_args(args):
+    argv = [
+        "--iterations", str(args.iterations),
+        "--warmup", str(args.warmup),
+        "--seed", str(args.seed),
+        "--scenarios", *args.scenarios,
+        "--drivers", *args.drivers,
+    ]
+    if args.orders is not None:
+        argv += ["--orders", str(args.orders)]
+    if args.no_result_cache:
+        argv.append("--no-result-cache")
+    if args.max_cost is not None:
+        argv += ["--max-cost", str(args.max_cost)]
+    return argv
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, nargs="+", default=[1000])
+    parser.add_argument("--orders", type=int, help="order history size, defaults to --products")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--drivers", nargs="+", choices=list(DRIVERS), default=list(DRIVERS))
+    parser.add_argument("--no-result-cache", action="store_true")
+    parser.add_argument(
+        "--max-cost", type=int, help="query cost limit to apply, no limit when omitted"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    if len(args.products) == 1:
+        runs = [run_size(args, args.products[0])]
+    else:
+        # One process per size, so each size gets its own peak RSS
+        runs = []
+        for size in args.products:
+            command = [sys.executable, os.path.abspath(__file__), *child_args(args)]
+            command += ["--products", str(size)]
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            runs.extend(json.loads(output)["runs"])
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Synthetic catalogues and order histories for the benchmarks
+
+Generation is seeded, so the same arguments always give the same data
+and results stay comparable across commits.
+"""
+import random
+from datetime import datetime, timedelta
+
+CATEGORIES = (
+    "Electronics", "Fashion", "Home", "Garden", "Sports", "Books", "Toys",
+    "Beauty", "Automotive", "Grocery", "Health", "Office",
+)
+ADJECTIVES = (
+    "Classic", "Compact", "Deluxe", "Ergonomic", "Gaming", "Portable", "Premium",
+    "Smart", "Wireless", "Vintage", "Ultra", "Eco",
+)
+NOUNS = (
+    "Laptop", "Phone", "Headphones", "Chair", "Lamp", "Backpack", "Watch",
+    "Keyboard", "Bottle", "Jacket", "Speaker", "Camera", "Blender", "Sneakers",
+)
+BRANDS = ("ASUS", "Samsung", "Sony", "Logitech", "Philips", "Nike", "IKEA", "Xiaomi")
+CUSTOMERS = tuple(f"Customer {i}" for i in range(1, 501))
+STATUS_WEIGHTS = (("PENDING", 20), ("PAID", 25), ("SHIPPED", 20), ("DELIVERED", 30), ("CANCELLED", 5))
+
+# Orders are spread over this many days before the generation epoch
+ORDER_HISTORY_DAYS = 90
+EPOCH = datetime(2024, 1, 1)
+
+
+def iter_products(count, seed=0):
+    """Yield products one at a time, for loading without a full dict list"""
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        noun = rng.choice(NOUNS)
+        name = f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {noun} {i}"
+        yield {
+            "id": str(i),
+            "name": name,
+            # Prices in rupiah, rounded like real price tags
+            "price": rng.randint(10, 40_000) * 1000,
+            "stock": rng.randint(0, 500),
+            "category": rng.choice(CATEGORIES),
+            "description": f"{name} for everyday {noun.lower()} needs",
+        }
+
+
+def generate_products(count, seed=0):
+    return list(iter_products(count, seed))
+
+
+def generate_orders(products, count, seed=0):
+    """Orders over random products, in created_at order like the live store"""
+    rng = random.Random(seed + 1)
+    statuses = [status for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+    start = EPOCH - timedelta(days=ORDER_HISTORY_DAYS)
+    step = timedelta(days=ORDER_HISTORY_DAYS) / max(count, 1)
+
+    orders = []
+    for i in range(1, count + 1):
+        product = products[rng.randrange(len(products))]
+        quantity = rng.randint(1, 5)
+        orders.append(
+            {
+                "id": str(i),
+                "product_id": product["id"],
+                "product_name": product["name"],
+                "quantity": quantity,
+                "total_price": product["price"] * quantity,
+                "customer_name": rng.choice(CUSTOMERS),
+                "status": rng.choices(statuses, weights)[0],
+                "created_at": (start + step * i).isoformat(),
+            }
+        )
+    return orders
+
+
+def load_catalog(app, products, orders):
+    """Replace the app's in-memory stores and rebuild everything derived
+
+    Only the in-memory stores are replaced; run the benchmarks without
+    ECOMMERCE_DB_PATH so nothing is written to a real database.
+    """
+    app.products_db.clear()
+    app.products_db.extend(products)
+    app.orders_db[:] = orders
+    app.orders_by_id.clear()
+    app.orders_by_id.update((o["id"], o) for o in orders)
+
+    app.order_ids.reset(len(orders) + 1)
+    app.search_index = app.SearchIndex(app.products_db)
+    app.order_index = app.OrderIndex(orders)
+    app.rebuild_analytics()
+    app.store_versions.bump("products", "orders")
+    app.query_cache.clear()
+    app.result_cache.clear()
@@ -0,0 +1,67 @@
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+
+class DataLoader:
+    """Per-request batching loader for synchronous execution
+
+    Sync execution resolves list items one after another, so there is no
+    event-loop tick to collect keys in. Instead the resolver of the parent
+    list queues the keys its children will ask for with ``prime_keys()``,
+    and the first ``load()`` fetches every queued key with one call to
+    ``batch_load_fn``. Results are cached for the rest of the request, so
+    repeated keys are only fetched once.
+
+    ``batch_load_fn(keys)`` must return one value per key, in key order.
+    """
+
+    def __init__(self, batch_load_fn):
+        self.batch_load_fn = batch_load_fn
+        self._cache = {}
+        self._queue = {}
+        self.batch_calls = 0
+
+    def prime_keys(self, keys):
+        cache = self._cache
+        for key in keys:
+            if key not in cache:
+                self._queue[key] = None
+
+    def load(self, key):
+        if key not in self._cache:
+            self._queue[key] = None
+            self._dispatch()
+        return self._cache[key]
+
+    def load_many(self, keys):
+        self.prime_keys(keys)
+        return [self.load(key) for key in keys]
+
+    def _dispatch(self):
+        keys = list(self._queue)
+        self._queue.clear()
+        values = self.batch_load_fn(keys)
+        self.batch_calls += 1
+        self._cache.update(zip(keys, values))
+
+
+def selects_field(info, name):
+    """Whether ``name`` is selected anywhere below the current field"""
+    pending = [node.selection_set for node in info.field_nodes]
+    seen_fragments = set()
+    while pending:
+        selection_set = pending.pop()
+        if selection_set is None:
+            continue
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if selection.name.value == name:
+                    return True
+                pending.append(selection.selection_set)
+            elif isinstance(selection, InlineFragmentNode):
+                pending.append(selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment_name = selection.name.value
+                if fragment_name not in seen_fragments:
+                    seen_fragments.add(fragment_name)
+                    pending.append(info.fragments[fragment_name].selection_set)
+    return False
@@ -0,0 +1,123 @@
+import itertools
+import threading
+
+
+class StockReservations:
+    """Per-product locks around stock reads and writes
+
+    Each product gets its own lock, so orders for different products never
+    wait on each other's stock lock. The check and the decrement happen
+    under the same lock, which is what prevents overselling. Keep
+    ``on_change`` callbacks short: whatever global lock they take is held
+    while the product is locked.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def lock_for(self, product_id):
+        lock = self._locks.get(product_id)
+        if lock is None:
+            # Only the first access per product takes the global guard
+            with self._locks_guard:
+                lock = self._locks.setdefault(product_id, threading.Lock())
+        return lock
+
+    def reserve(self, product, quantity, on_change=None):
+        """Take quantity from stock, return (success, stock after the attempt)
+
+        ``on_change(product)`` runs under the product lock after a successful
+        reservation, so whatever it records is ordered with every other
+        stock change of that product. Quantity must be positive, a negative
+        one would add stock back.
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        with self.lock_for(product["id"]):
+            stock = product["stock"]
+            if stock < quantity:
+                return False, stock
+            product["stock"] = stock - quantity
+            if on_change is not None:
+                on_change(product)
+            return True, product["stock"]
+
+    def _lock_all(self, product_ids):
+        # Always lock in id order so two bulk calls cannot deadlock
+        locks = [self.lock_for(product_id) for product_id in sorted(product_ids)]
+        for lock in locks:
+            lock.acquire()
+        return locks
+
+    @staticmethod
+    def _release_all(locks):
+        for lock in reversed(locks):
+            lock.release()
+
+    def reserve_many(self, lines, on_change=None):
+        """Reserve stock for (product, quantity) lines, all or nothing
+
+        Quantities for the same product are added up before checking.
+        Returns ``(success, short)`` where ``short`` maps the id of every
+        product without enough stock to its available stock. On success
+        ``on_change(products)`` runs while all the product locks are held.
+        """
+        products = {}
+        totals = {}
+        for product, quantity in lines:
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            products[product["id"]] = product
+            totals[product["id"]] = totals.get(product["id"], 0) + quantity
+
+        locks = self._lock_all(products)
+        try:
+            short = {
+                product_id: products[product_id]["stock"]
+                for product_id, total in totals.items()
+                if products[product_id]["stock"] < total
+            }
+            if short:
+                return False, short
+            for product_id, total in totals.items():
+                products[product_id]["stock"] -= total
+            if on_change is not None:
+                on_change(list(products.values()))
+            return True, {}
+        finally:
+            self._release_all(locks)
+
+    def set_stock_many(self, updates, on_change=None):
+        """Apply (product, new_stock) updates under all their locks at once"""
+        locks = self._lock_all({product["id"] for product, _ in updates})
+        try:
+            for product, new_stock in updates:
+                product["stock"] = new_stock
+                if on_change is not None:
+                    on_change(product)
+        finally:
+            self._release_all(locks)
+
+    def set_stock(self, product, new_stock, on_change=None):
+        with self.lock_for(product["id"]):
+            product["stock"] = new_stock
+            if on_change is not None:
+                on_change(product)
+
+
+class OrderIdGenerator:
+    """Thread-safe order id sequence without a lock
+
+    ``next()`` on an ``itertools.count`` runs entirely in C under the GIL,
+    so concurrent callers always get distinct ids.
+    """
+
+    def __init__(self, start=1):
+        self._counter = itertools.count(start)
+
+    def next_id(self):
+        return str(next(self._counter))
+
+    def reset(self, start):
+        self._counter = itertools.count(start)
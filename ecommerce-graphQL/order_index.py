@@ -0,0 +1,79 @@
+import threading
+from array import array
+from bisect import bisect_left, insort
+
+from pagination import page_positions
+
+
+def _customer_key(customer_name):
+    return customer_name.lower()
+
+
+class OrderIndex:
+    """Positions in the order list per status, per customer and per both
+
+    Each key maps to a sorted array of positions in the order list, so a
+    filtered page bisects to its cursor and reads only the orders on the
+    page instead of testing every order from the cursor onward. Customer
+    names match case-insensitively.
+
+    Orders must be added in list order. A status change moves the order's
+    position between the status arrays.
+    """
+
+    def __init__(self, orders=()):
+        self._by_status = {}
+        self._by_customer = {}
+        self._by_status_customer = {}
+        self._positions = {}  # order id -> position
+        self._lock = threading.Lock()
+        for position, order in enumerate(orders):
+            self._add(position, order)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def add(self, position, order):
+        with self._lock:
+            self._add(position, order)
+
+    def _add(self, position, order):
+        status = order["status"]
+        customer = _customer_key(order["customer_name"])
+        self._by_status.setdefault(status, array("q")).append(position)
+        self._by_customer.setdefault(customer, array("q")).append(position)
+        self._by_status_customer.setdefault((status, customer), array("q")).append(position)
+        self._positions[order["id"]] = position
+
+    def change_status(self, order, old_status):
+        """Move an order indexed under ``old_status`` to its current status"""
+        with self._lock:
+            position = self._positions[order["id"]]
+            customer = _customer_key(order["customer_name"])
+            for index, old_key, new_key in (
+                (self._by_status, old_status, order["status"]),
+                (self._by_status_customer, (old_status, customer), (order["status"], customer)),
+            ):
+                positions = index[old_key]
+                del positions[bisect_left(positions, position)]
+                insort(index.setdefault(new_key, array("q")), position)
+
+    def _matching(self, status, customer_name):
+        if customer_name is None:
+            return self._by_status.get(status, ())
+        customer = _customer_key(customer_name)
+        if status is None:
+            return self._by_customer.get(customer, ())
+        return self._by_status_customer.get((status, customer), ())
+
+    def count(self, status=None, customer_name=None):
+        """Number of orders matching the filters, at least one must be given"""
+        with self._lock:
+            return len(self._matching(status, customer_name))
+
+    def page(self, prefix, first=None, after=None, status=None, customer_name=None, reverse=False):
+        """Positions of one page of matching orders, see ``page_positions``"""
+        with self._lock:
+            return page_positions(
+                self._matching(status, customer_name), prefix, first, after, reverse
+            )
@@ -0,0 +1,55 @@
+import base64
+from bisect import bisect_left, bisect_right
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(prefix, index):
+    return base64.b64encode(f"{prefix}:{index}".encode()).decode()
+
+
+def decode_cursor(prefix, cursor):
+    """Return the list index stored in a cursor, or raise ValueError"""
+    try:
+        kind, index = base64.b64decode(cursor.encode()).decode().split(":", 1)
+        index = int(index)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if kind != prefix or index < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return index
+
+
+def page_positions(positions, prefix, first=None, after=None, reverse=False):
+    """Return ``(page, has_next_page)`` for a sorted sequence of positions
+
+    Cursors hold a position, so the page start is found by bisecting
+    ``positions`` and only the page itself is sliced out.
+    """
+    if first is None:
+        first = DEFAULT_PAGE_SIZE
+    if first < 0:
+        raise ValueError("Argument 'first' must be non-negative")
+    first = min(first, MAX_PAGE_SIZE)
+
+    if reverse:
+        stop = len(positions)
+        if after is not None:
+            stop = bisect_left(positions, decode_cursor(prefix, after))
+        window = positions[max(stop - first - 1, 0) : stop][::-1]
+    else:
+        start = 0 if after is None else bisect_right(positions, decode_cursor(prefix, after))
+        window = positions[start : start + first + 1]
+    return window[:first], len(window) > first
+
+
+def paginate(items, prefix, first=None, after=None, reverse=False):
+    """Return one page of a list as ``(edges, has_next_page)``
+
+    Cursors are positions in ``items``, which only ever grows by appending,
+    so a page is found by indexing from the cursor instead of copying or
+    slicing the whole list. Edges are ``(cursor, item)``.
+    """
+    page, has_next_page = page_positions(range(len(items)), prefix, first, after, reverse)
+    return [(encode_cursor(prefix, index), items[index]) for index in page], has_next_page
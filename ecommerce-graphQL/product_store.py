@@ -0,0 +1,234 @@
+from array import array
+from collections.abc import Mapping
+
+FIELDS = ("id", "name", "price", "stock", "category", "description")
+
+
+class StringColumn:
+    """Append-only strings packed into one UTF-8 buffer with end offsets"""
+
+    __slots__ = ("_data", "_ends")
+
+    def __init__(self):
+        self._data = bytearray()
+        self._ends = array("q")
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __getitem__(self, index):
+        start = self._ends[index - 1] if index else 0
+        return self._data[start : self._ends[index]].decode()
+
+    def append(self, value):
+        self._data += value.encode()
+        self._ends.append(len(self._data))
+
+    def nbytes(self):
+        return len(self._data) + self._ends.itemsize * len(self._ends)
+
+
+class ProductRow:
+    """View of one product in a ProductStore
+
+    Reads like a product dict (``row["stock"]``) for the stock and storage
+    code, and like an object (``row.stock``) for the GraphQL resolvers.
+    Nothing is copied: every read goes to the store's columns.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    @property
+    def id(self):
+        return self._store._ids[self._index]
+
+    @property
+    def name(self):
+        return self._store._names[self._index]
+
+    @property
+    def price(self):
+        return self._store._prices[self._index]
+
+    @property
+    def stock(self):
+        return self._store._stocks[self._index]
+
+    @property
+    def category(self):
+        store = self._store
+        return store._categories[store._category_codes[self._index]]
+
+    @property
+    def description(self):
+        return self._store._descriptions[self._index]
+
+    def __getitem__(self, field):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        if field == "stock":
+            self._store._stocks[self._index] = value
+        elif field == "price":
+            self._store._prices[self._index] = value
+        elif field in FIELDS:
+            raise TypeError(f"Product field '{field}' is read-only")
+        else:
+            raise KeyError(field)
+
+    def get(self, field, default=None):
+        return getattr(self, field) if field in FIELDS else default
+
+    def keys(self):
+        return FIELDS
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, ProductRow):
+            return NotImplemented
+        return self._store is other._store and self._index == other._index
+
+    def __hash__(self):
+        return hash((id(self._store), self._index))
+
+    def __repr__(self):
+        return f"ProductRow({self.to_dict()!r})"
+
+
+class ProductIndex(Mapping):
+    """Read-only ``product id -> ProductRow`` mapping over a store"""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, product_id):
+        return ProductRow(self._store, self._store._positions[product_id])
+
+    def __contains__(self, product_id):
+        return product_id in self._store._positions
+
+    def __iter__(self):
+        return iter(self._store._positions)
+
+    def __len__(self):
+        return len(self._store._positions)
+
+
+class ProductStore:
+    """Columnar product storage
+
+    Prices and stock live in typed arrays, categories are interned to small
+    integer codes, and names and descriptions are packed into string
+    buffers, so a product costs a fraction of a six-key dict. Indexing,
+    iterating and ``by_id`` hand out ``ProductRow`` views that are created
+    on demand and hold no data of their own.
+
+    Appends must be serialized by the caller. Writes to a single row's
+    price or stock are plain array stores; callers lock per product.
+    """
+
+    def __init__(self, products=()):
+        self.by_id = ProductIndex(self)
+        self.clear()
+        self.extend(products)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ProductRow(self, i) for i in range(*index.indices(len(self._ids)))]
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("product index out of range")
+        return ProductRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self._ids)):
+            yield ProductRow(self, index)
+
+    def _category_code(self, category):
+        code = self._category_index.get(category)
+        if code is None:
+            code = self._category_index[category] = len(self._categories)
+            self._categories.append(category)
+            self._category_counts.append(0)
+        return code
+
+    def append(self, product):
+        """Copy a product dict into the columns and return its row"""
+        product_id = product["id"]
+        if product_id in self._positions:
+            raise ValueError(f"Duplicate product id '{product_id}'")
+        name, price, stock = product["name"], product["price"], product["stock"]
+        category = self._category_code(product["category"])
+        index = len(self._ids)
+        self._prices.append(price)
+        self._stocks.append(stock)
+        self._names.append(name)
+        self._descriptions.append(product.get("description") or "")
+        self._category_codes.append(category)
+        self._category_counts[category] += 1
+        self._ids.append(product_id)
+        self._positions[product_id] = index
+        return ProductRow(self, index)
+
+    def extend(self, products):
+        for product in products:
+            self.append(product)
+
+    def clear(self):
+        # by_id stays the same object, callers keep references to it
+        self._ids = []
+        self._positions = {}  # product id -> row index
+        self._names = StringColumn()
+        self._descriptions = StringColumn()
+        self._prices = array("q")
+        self._stocks = array("q")
+        self._category_codes = array("I")
+        self._categories = []  # code -> category name
+        self._category_index = {}  # category name -> code
+        self._category_counts = array("q")  # code -> number of products
+
+    def get(self, product_id):
+        index = self._positions.get(product_id)
+        return ProductRow(self, index) if index is not None else None
+
+    def _codes_for(self, category):
+        category = category.lower()
+        return {code for code, name in enumerate(self._categories) if name.lower() == category}
+
+    def count_in_category(self, category):
+        """Number of rows in_category() returns, without scanning the rows"""
+        return sum(self._category_counts[code] for code in self._codes_for(category))
+
+    def in_category(self, category):
+        """Rows whose category matches case-insensitively, in store order"""
+        codes = self._codes_for(category)
+        if not codes:
+            return []
+        return [
+            ProductRow(self, index)
+            for index, code in enumerate(self._category_codes)
+            if code in codes
+        ]
+
+    def nbytes(self):
+        """Approximate bytes held by the columns, excluding the id strings"""
+        arrays = (self._prices, self._stocks, self._category_codes)
+        return (
+            sum(column.itemsize * len(column) for column in arrays)
+            + self._names.nbytes()
+            + self._descriptions.nbytes()
+        )
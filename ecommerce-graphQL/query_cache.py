@@ -0,0 +1,119 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from graphql import GraphQLError, parse, validate
+
+
+class PersistedQueryNotFound(Exception):
+    """Raised when a client sends only a hash that is not in the cache"""
+
+
+class PersistedQueryMismatch(Exception):
+    """Raised when the sent query text does not match the sent hash"""
+
+
+class QueryCache:
+    """Bounded LRU cache of parsed and validated GraphQL documents
+
+    Documents are keyed by the raw query text. Automatic persisted queries
+    (APQ) are supported by also remembering the SHA-256 hash of every query
+    text, so clients can send only the hash and resend the full text on a
+    miss.
+    """
+
+    def __init__(self, schema, maxsize=256):
+        self.schema = schema
+        self.maxsize = maxsize
+        self._documents = OrderedDict()
+        self._persisted = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.persisted_hits = 0
+        self.persisted_misses = 0
+
+    @staticmethod
+    def hash_query(query):
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def resolve_persisted(self, query, sha256_hash):
+        """Return the query text for an APQ request, registering it if sent"""
+        if query is None:
+            with self._lock:
+                query = self._persisted.get(sha256_hash)
+                if query is None:
+                    self.persisted_misses += 1
+                    raise PersistedQueryNotFound("PersistedQueryNotFound")
+                self._persisted.move_to_end(sha256_hash)
+                self.persisted_hits += 1
+            return query
+
+        if self.hash_query(query) != sha256_hash:
+            raise PersistedQueryMismatch("provided sha does not match query")
+
+        with self._lock:
+            self._persisted[sha256_hash] = query
+            self._persisted.move_to_end(sha256_hash)
+            if len(self._persisted) > self.maxsize:
+                self._persisted.popitem(last=False)
+        return query
+
+    def get_document(self, query, tracer=None):
+        """Return (document, errors) for the query text
+
+        Syntax errors are returned as a list of errors with no document and
+        are not cached, validation errors are cached with the document.
+        When a tracer is given its parsing and validation phases are set.
+        """
+        with self._lock:
+            entry = self._documents.get(query)
+            if entry is not None:
+                self._documents.move_to_end(query)
+                self.hits += 1
+        if entry is not None:
+            if tracer is not None:
+                now = tracer.offset()
+                tracer.parsing = tracer.validation = tracer.phase(now, now)
+            return entry
+
+        with self._lock:
+            self.misses += 1
+
+        start = tracer.offset() if tracer is not None else 0
+        try:
+            document = parse(query)
+        except GraphQLError as error:
+            return None, [error]
+        parsed = tracer.offset() if tracer is not None else 0
+
+        entry = (document, validate(self.schema, document))
+        if tracer is not None:
+            tracer.parsing = tracer.phase(start, parsed)
+            tracer.validation = tracer.phase(parsed, tracer.offset())
+
+        with self._lock:
+            self._documents[query] = entry
+            if len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+        return entry
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._documents),
+            "maxsize": self.maxsize,
+            "persisted_hits": self.persisted_hits,
+            "persisted_misses": self.persisted_misses,
+            "persisted_size": len(self._persisted),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self._persisted.clear()
+            self.hits = self.misses = 0
+            self.persisted_hits = self.persisted_misses = 0
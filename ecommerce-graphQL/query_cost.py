@@ -0,0 +1,216 @@
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    VariableNode,
+    get_named_type,
+)
+from graphql.execution.values import get_variable_values
+from graphql.utilities import get_operation_ast
+
+
+class QueryCost:
+    """Result of analysing one operation"""
+
+    def __init__(self, cost=0, depth=0, aliases=0):
+        self.cost = cost
+        self.depth = depth
+        self.aliases = aliases
+
+
+class QueryCostAnalyzer:
+    """Static cost, depth and alias analysis run before execution
+
+    Every object field costs ``default_field_cost`` (scalars are free)
+    unless ``field_costs`` says otherwise, keyed by ``"Type.field"``. For
+    fields that return many items, each item costs 1 plus its
+    sub-selection, times the number of items: ``list_sizes`` for the field
+    (a number or a callable taking the field arguments), else the
+    ``first`` argument, else ``default_list_size`` for list types.
+
+    Introspection fields (``__schema``, ``__typename``...) are not counted,
+    so tools like GraphiQL keep working under tight limits.
+    """
+
+    def __init__(
+        self,
+        schema,
+        field_costs=None,
+        list_sizes=None,
+        max_depth=10,
+        max_aliases=20,
+        max_cost=5000,
+        default_field_cost=1,
+        default_list_size=100,
+    ):
+        self.schema = schema
+        self.field_costs = field_costs or {}
+        self.list_sizes = list_sizes or {}
+        self.max_depth = max_depth
+        self.max_aliases = max_aliases
+        self.max_cost = max_cost
+        self.default_field_cost = default_field_cost
+        self.default_list_size = default_list_size
+
+    def analyze(self, document, variables=None, operation_name=None):
+        operation = get_operation_ast(document, operation_name)
+        if operation is None:
+            # Let execution report the missing or ambiguous operation
+            return QueryCost()
+
+        # Coerce variables like execution will, so sizes are real ints
+        variables = get_variable_values(
+            self.schema, operation.variable_definitions or (), variables or {}
+        )
+        if isinstance(variables, list):
+            # Invalid variables: execution reports them and runs nothing
+            return QueryCost()
+
+        root_type = self.schema.get_root_type(operation.operation)
+        fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        result = QueryCost()
+        result.cost = self._selection_cost(
+            operation.selection_set, root_type, 1, variables, fragments, result, ()
+        )
+        return result
+
+    def check(self, cost):
+        """Return the errors for every limit the analysed operation exceeds"""
+        errors = []
+        if cost.depth > self.max_depth:
+            errors.append(
+                GraphQLError(f"Query depth {cost.depth} exceeds maximum depth {self.max_depth}")
+            )
+        if cost.aliases > self.max_aliases:
+            errors.append(
+                GraphQLError(f"Query uses {cost.aliases} aliases, maximum is {self.max_aliases}")
+            )
+        if cost.cost > self.max_cost:
+            errors.append(
+                GraphQLError(f"Query cost {cost.cost} exceeds maximum cost {self.max_cost}")
+            )
+        return errors
+
+    def extensions(self, cost):
+        return {
+            "cost": {
+                "requestedQueryCost": cost.cost,
+                "maximumAvailable": self.max_cost,
+                "depth": cost.depth,
+                "maximumDepth": self.max_depth,
+                "aliases": cost.aliases,
+                "maximumAliases": self.max_aliases,
+            }
+        }
+
+    def _selection_cost(
+        self, selection_set, parent_type, depth, variables, fragments, result, visited
+    ):
+        total = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                total += self._field_cost(
+                    selection, parent_type, depth, variables, fragments, result, visited
+                )
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = self.schema.get_type(selection.type_condition.name.value)
+                total += self._selection_cost(
+                    selection.selection_set,
+                    fragment_type,
+                    depth,
+                    variables,
+                    fragments,
+                    result,
+                    visited,
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = fragments.get(name)
+                if fragment is None or name in visited:
+                    continue
+                total += self._selection_cost(
+                    fragment.selection_set,
+                    self.schema.get_type(fragment.type_condition.name.value),
+                    depth,
+                    variables,
+                    fragments,
+                    result,
+                    visited + (name,),
+                )
+        return total
+
+    def _field_cost(self, node, parent_type, depth, variables, fragments, result, visited):
+        name = node.name.value
+        if name.startswith("__"):
+            return 0
+        if node.alias is not None:
+            result.aliases += 1
+        result.depth = max(result.depth, depth)
+
+        if not isinstance(parent_type, GraphQLObjectType):
+            return 0
+        field = parent_type.fields.get(name)
+        if field is None:
+            return 0
+
+        named_type = get_named_type(field.type)
+        key = f"{parent_type.name}.{name}"
+        if not isinstance(named_type, GraphQLObjectType):
+            return self.field_costs.get(key, 0)
+
+        args = self._arguments(node, variables)
+        children = 0
+        if node.selection_set is not None:
+            children = self._selection_cost(
+                node.selection_set,
+                named_type,
+                depth + 1,
+                variables,
+                fragments,
+                result,
+                visited,
+            )
+        cost = self.field_costs.get(key, self.default_field_cost)
+        size = self._list_size(key, field.type, args)
+        if size is None:
+            return cost + children
+        return cost + size * (1 + children)
+
+    def _list_size(self, key, field_type, args):
+        # Sizes are clamped at 0, a negative count must not lower the cost
+        size = self.list_sizes.get(key)
+        if size is not None:
+            return max(size(args) if callable(size) else size, 0)
+        first = args.get("first")
+        if isinstance(first, int):
+            return max(first, 0)
+        if isinstance(field_type, GraphQLNonNull):
+            field_type = field_type.of_type
+        if isinstance(field_type, GraphQLList):
+            return self.default_list_size
+        return None
+
+    @staticmethod
+    def _arguments(node, variables):
+        args = {}
+        for argument in node.arguments:
+            value = argument.value
+            if isinstance(value, VariableNode):
+                args[argument.name.value] = variables.get(value.name.value)
+            elif isinstance(value, IntValueNode):
+                args[argument.name.value] = int(value.value)
+            elif hasattr(value, "value"):
+                args[argument.name.value] = value.value
+        return args
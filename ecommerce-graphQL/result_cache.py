@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from graphql import OperationType, Visitor, get_named_type, print_ast, visit
+from graphql.utilities import TypeInfo, TypeInfoVisitor, get_operation_ast
+
+# Per-document plans are small, keep as many as the parsed-document cache
+MAX_PLANS = 512
+
+
+class StoreVersions:
+    """Version counter per store, bumped by every mutation that changes it"""
+
+    def __init__(self, *stores):
+        self._versions = {store: 0 for store in stores}
+        self._lock = threading.Lock()
+
+    def bump(self, *stores):
+        with self._lock:
+            for store in stores:
+                self._versions[store] += 1
+
+    def get(self, store):
+        return self._versions[store]
+
+
+class _CachePlan(Visitor):
+    """Collects the stores and the smallest cache hint a document touches"""
+
+    def __init__(self, type_info, type_stores, hints):
+        super().__init__()
+        self.type_info = type_info
+        self.type_stores = type_stores
+        self.hints = hints
+        self.stores = set()
+        self.max_age = None
+
+    def enter_field(self, node, *_):
+        parent_type = self.type_info.get_parent_type()
+        field = self.type_info.get_field_def()
+        if parent_type is None or field is None:
+            return
+        store = self.type_stores.get(get_named_type(field.type).name)
+        if store is not None:
+            self.stores.add(store)
+        hint = self.hints.get(f"{parent_type.name}.{node.name.value}")
+        if hint is not None and (self.max_age is None or hint < self.max_age):
+            self.max_age = hint
+
+
+class ResultCache:
+    """Cache of query results, invalidated by store version counters
+
+    Entries are keyed by the normalized document, operation name and
+    variables, plus the current version of every store the document reads
+    from (``type_stores`` maps GraphQL type names to store names). A
+    mutation bumps the versions of the stores it changes, so later lookups
+    miss exactly the entries that read those stores.
+
+    ``hints`` are per-field max ages in seconds keyed by ``"Type.field"``;
+    a result lives as long as its smallest hint and a hint of 0 disables
+    caching for any query selecting that field. Mutations are never cached.
+    """
+
+    def __init__(self, schema, versions, type_stores, hints=None, maxsize=1024):
+        self.schema = schema
+        self.versions = versions
+        self.type_stores = type_stores
+        self.hints = hints or {}
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def _plan(self, document):
+        plan = self._plans.get(id(document))
+        if plan is not None and plan[0] is document:
+            return plan[1:]
+
+        type_info = TypeInfo(self.schema)
+        collector = _CachePlan(type_info, self.type_stores, self.hints)
+        visit(document, TypeInfoVisitor(type_info, collector))
+        plan = (document, print_ast(document), tuple(sorted(collector.stores)), collector.max_age)
+        with self._lock:
+            # Keeping the document referenced makes id() safe to reuse as key
+            self._plans[id(document)] = plan
+            if len(self._plans) > MAX_PLANS:
+                self._plans.popitem(last=False)
+        return plan[1:]
+
+    def key(self, document, variables=None, operation_name=None):
+        """Return (key, max_age), or (None, None) when not cacheable"""
+        operation = get_operation_ast(document, operation_name)
+        if operation is None or operation.operation != OperationType.QUERY:
+            return None, None
+
+        normalized, stores, max_age = self._plan(document)
+        if max_age == 0:
+            self.uncacheable += 1
+            return None, None
+        try:
+            variables_key = json.dumps(variables, sort_keys=True) if variables else ""
+        except (TypeError, ValueError):
+            return None, None
+        versions = tuple(self.versions.get(store) for store in stores)
+        return (normalized, operation_name, variables_key, versions), max_age
+
+    def get(self, key):
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._results.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._results[key]
+            self.misses += 1
+        return None
+
+    def set(self, key, result, max_age=None):
+        expires = time.monotonic() + max_age if max_age is not None else None
+        with self._lock:
+            self._results[key] = (result, expires)
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "uncacheable": self.uncacheable,
+            "size": len(self._results),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = self.uncacheable = 0
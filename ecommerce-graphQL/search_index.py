@@ -0,0 +1,157 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+NGRAM = 3
+
+
+def _ngrams(text):
+    return {text[i : i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class SearchIndex:
+    """Inverted n-gram index over product name/description plus a price index
+
+    Keyword matching keeps the semantics of a case-insensitive substring
+    search: n-gram postings only narrow down the candidates, which are then
+    checked with ``in``. Keywords shorter than the n-gram size skip the
+    text postings and are checked against the price candidates directly.
+
+    Results are returned in insertion order, like scanning ``products_db``.
+    Writers and searches share one lock, so a search never sees a product
+    that is only half indexed.
+    """
+
+    def __init__(self, products=()):
+        self._products = {}  # position -> product
+        self._positions = {}  # product id -> position
+        self._texts = {}  # position -> (lower name, lower description)
+        self._prices_by_position = {}  # position -> indexed price
+        self._postings = {}  # n-gram -> set of positions
+        self._prices = []  # sorted (price, position)
+        self._next_position = 0
+        self._lock = threading.Lock()
+        for product in products:
+            self._add(product)
+
+    def __len__(self):
+        return len(self._products)
+
+    def add(self, product):
+        with self._lock:
+            self._add(product)
+
+    def _add(self, product):
+        position = self._next_position
+        self._next_position += 1
+        # Per-position data first, the position is published last
+        self._index(position, product)
+        self._products[position] = product
+        self._positions[product["id"]] = position
+
+    def update(self, product):
+        """Re-index a product after its name, description or price changed"""
+        with self._lock:
+            position = self._positions.get(product["id"])
+            if position is None:
+                self._add(product)
+                return
+            self._unindex(position)
+            self._products[position] = product
+            self._index(position, product)
+
+    def remove(self, product_id):
+        with self._lock:
+            position = self._positions.pop(product_id, None)
+            if position is None:
+                return
+            self._unindex(position)
+            del self._products[position]
+
+    def _index(self, position, product):
+        name = product["name"].lower()
+        description = (product.get("description") or "").lower()
+        self._texts[position] = (name, description)
+        for gram in _ngrams(name) | _ngrams(description):
+            self._postings.setdefault(gram, set()).add(position)
+        self._prices_by_position[position] = product["price"]
+        insort(self._prices, (product["price"], position))
+
+    def _unindex(self, position):
+        name, description = self._texts.pop(position)
+        for gram in _ngrams(name) | _ngrams(description):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(position)
+                if not postings:
+                    del self._postings[gram]
+        price = self._prices_by_position.pop(position)
+        del self._prices[bisect_left(self._prices, (price, position))]
+
+    def _price_bounds(self, min_price, max_price):
+        lo = 0 if min_price is None else bisect_left(self._prices, (min_price,))
+        if max_price is None:
+            hi = len(self._prices)
+        else:
+            hi = bisect_right(self._prices, (max_price, float("inf")))
+        return lo, hi
+
+    def _price_range(self, min_price, max_price):
+        lo, hi = self._price_bounds(min_price, max_price)
+        return {position for _, position in self._prices[lo:hi]}
+
+    def _keyword_candidates(self, keyword):
+        grams = _ngrams(keyword)
+        if not grams:
+            return None
+        postings = sorted(
+            (self._postings.get(gram, ()) for gram in grams), key=len
+        )
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            if not candidates:
+                break
+            candidates &= other
+        return candidates
+
+    def estimate(self, keyword, min_price=None, max_price=None):
+        """Cheap upper bound on the number of results search() returns
+
+        The smallest n-gram posting list bounds the keyword matches, and
+        the sorted prices bound the price matches; no candidates are built.
+        """
+        keyword = keyword.lower()
+        with self._lock:
+            bound = len(self._products)
+            for gram in _ngrams(keyword):
+                bound = min(bound, len(self._postings.get(gram, ())))
+            if min_price is not None or max_price is not None:
+                lo, hi = self._price_bounds(min_price, max_price)
+                bound = min(bound, max(hi - lo, 0))
+            return bound
+
+    def search(self, keyword, min_price=None, max_price=None):
+        keyword = keyword.lower()
+        with self._lock:
+            candidates = self._keyword_candidates(keyword)
+            if min_price is not None or max_price is not None:
+                if candidates is None:
+                    candidates = self._price_range(min_price, max_price)
+                else:
+                    # Keyword postings are usually the smaller set, so check
+                    # prices on those instead of materializing the whole range
+                    prices = self._prices_by_position
+                    candidates = {
+                        position
+                        for position in candidates
+                        if (min_price is None or prices[position] >= min_price)
+                        and (max_price is None or prices[position] <= max_price)
+                    }
+            if candidates is None:
+                candidates = self._products.keys()
+
+            results = []
+            for position in sorted(candidates):
+                name, description = self._texts[position]
+                if keyword in name or keyword in description:
+                    results.append(self._products[position])
+            return results
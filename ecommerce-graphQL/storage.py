@@ -0,0 +1,405 @@
+import json
+import mmap
+import os
+import sqlite3
+import threading
+
+PRODUCT_COLUMNS = ("id", "name", "price", "stock", "category", "description")
+ORDER_COLUMNS = (
+    "id",
+    "product_id",
+    "product_name",
+    "quantity",
+    "total_price",
+    "customer_name",
+    "status",
+    "created_at",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    stock INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    total_price INTEGER NOT NULL,
+    customer_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _upsert_sql(table, columns):
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "id")
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT(id) DO UPDATE SET {updates}"
+    )
+
+
+UPSERT_PRODUCT = _upsert_sql("products", PRODUCT_COLUMNS)
+UPSERT_ORDER = _upsert_sql("orders", ORDER_COLUMNS)
+
+
+def create_storage(path=None, seed_products=(), **options):
+    """SQLite storage when a path is given, in-memory storage otherwise"""
+    if path:
+        return SQLiteStorage(path, seed_products, **options)
+    return MemoryStorage(seed_products)
+
+
+class MemoryStorage:
+    """Keeps products and orders in process memory only
+
+    This is also the interface every storage backend implements.
+    ``load()`` hands the products and orders over to the caller and keeps
+    no reference to them; the mutations report each change through the
+    ``record_*`` methods, which only queue it, and then call ``sync()``
+    before answering the client.
+    """
+
+    def __init__(self, seed_products=()):
+        self._seed_products = seed_products
+
+    def load(self):
+        products = [dict(p) for p in self._seed_products]
+        self._seed_products = ()
+        return products, []
+
+    def record_product(self, product):
+        pass
+
+    def record_stock(self, product):
+        pass
+
+    def record_order(self, order):
+        pass
+
+    def sync(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def compact(self, blocking=True):
+        pass
+
+    def close(self):
+        pass
+
+
+def _read_journal(path):
+    """Yield journal records from a memory-mapped journal file"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in iter(mm.readline, b""):
+            if not line.endswith(b"\n"):
+                break  # torn write from a crash
+            yield json.loads(line)
+
+
+def _truncate_torn_tail(path):
+    """Cut a partially written last record so new records append cleanly"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b"\n") + 1
+        f.truncate(end)
+
+
+class SQLiteStorage(MemoryStorage):
+    """SQLite snapshot plus an append-only journal of changes
+
+    Every change is appended to ``<path>.journal`` as one JSON line with an
+    increasing sequence number. Writes are group-committed: the first
+    caller of ``sync()`` writes and fsyncs everything queued so far while
+    concurrent callers wait for that batch instead of each doing their own
+    fsync. With ``durable=False`` the journal is only written once
+    ``batch_size`` records are queued (or on ``flush()``/``close()``).
+    A failed write raises from ``sync()`` and keeps its records queued for
+    the next one; if the partial write cannot be cut off again, every later
+    ``sync()`` fails instead.
+
+    After ``compact_every`` records the journal is folded into the SQLite
+    snapshot in a background thread. On startup the snapshot is loaded and
+    only journal records newer than the snapshot are replayed.
+    """
+
+    def __init__(
+        self,
+        path,
+        seed_products=(),
+        durable=True,
+        batch_size=1024,
+        compact_every=100_000,
+    ):
+        super().__init__()
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compacting_path = path + ".journal.compacting"
+        self.durable = durable
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self._seed_products = seed_products
+        self._cond = threading.Condition()
+        self._pending = []
+        self._seq = 0  # last sequence number handed out
+        self._written = 0  # last sequence number written to the journal
+        self._flushing = False
+        self._since_compaction = 0
+        self._compact_lock = threading.Lock()
+        self._journal = None
+        self._broken = None  # write error that left the journal in an unknown state
+
+    # == Recovery ==
+
+    def load(self):
+        # A compaction interrupted by a crash is finished before reading
+        if os.path.exists(self.compacting_path):
+            self._apply_to_snapshot(self.compacting_path)
+            os.remove(self.compacting_path)
+
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.executescript(SCHEMA)
+            last_seq = self._last_seq(conn)
+            products = [
+                dict(zip(PRODUCT_COLUMNS, row))
+                for row in conn.execute(
+                    f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM products ORDER BY rowid"
+                )
+            ]
+            orders = [
+                dict(zip(ORDER_COLUMNS, row))
+                for row in conn.execute(
+                    f"SELECT {', '.join(ORDER_COLUMNS)} FROM orders ORDER BY rowid"
+                )
+            ]
+        finally:
+            conn.close()
+
+        _truncate_torn_tail(self.journal_path)
+        products_by_id = {p["id"]: p for p in products}
+        orders_by_id = None
+        replayed = 0
+        for record in _read_journal(self.journal_path):
+            if record["seq"] <= last_seq:
+                continue
+            op = record["op"]
+            if op == "order":
+                order = record["order"]
+                if orders_by_id is None:
+                    orders_by_id = {o["id"]: o for o in orders}
+                if order["id"] in orders_by_id:
+                    orders_by_id[order["id"]].update(order)
+                else:
+                    orders.append(order)
+                    orders_by_id[order["id"]] = order
+                    products_by_id[order["product_id"]]["stock"] -= order["quantity"]
+            elif op == "stock":
+                products_by_id[record["product_id"]]["stock"] = record["stock"]
+            elif op == "product":
+                product = record["product"]
+                if product["id"] in products_by_id:
+                    products_by_id[product["id"]].update(product)
+                else:
+                    products.append(product)
+                    products_by_id[product["id"]] = product
+            last_seq = record["seq"]
+            replayed += 1
+
+        self._seq = self._written = last_seq
+        self._since_compaction = replayed
+        self._journal = open(self.journal_path, "ab", buffering=0)
+
+        if not products and not orders and last_seq == 0:
+            for seed in self._seed_products:
+                product = dict(seed)
+                products.append(product)
+                self.record_product(product)
+            self.flush()
+        self._seed_products = ()
+
+        return products, orders
+
+    @staticmethod
+    def _last_seq(conn):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_seq'").fetchone()
+        return row[0] if row else 0
+
+    # == Journal ==
+
+    def _append(self, record):
+        # Serialized before taking the lock, only the sequence number is
+        # filled in under it, so callers holding stock locks wait briefly
+        body = json.dumps(record, separators=(",", ":")).encode()
+        with self._cond:
+            self._seq += 1
+            self._pending.append(b'{"seq":%d,' % self._seq + body[1:] + b"\n")
+            self._since_compaction += 1
+
+    def record_product(self, product):
+        self._append({"op": "product", "product": dict(product)})
+
+    def record_stock(self, product):
+        self._append({"op": "stock", "product_id": product["id"], "stock": product["stock"]})
+
+    def record_order(self, order):
+        # Replaying an order also takes its quantity out of stock, so the
+        # caller must record it while holding the product's stock lock
+        self._append({"op": "order", "order": dict(order)})
+
+    def sync(self):
+        if self.durable or len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write and fsync every record queued so far (group commit)"""
+        with self._cond:
+            target = self._seq
+            while self._written < target:
+                if self._flushing:
+                    # Another thread is writing, our records go in the next batch
+                    self._cond.wait()
+                    continue
+                self._write_pending()
+            start_compaction = (
+                self.compact_every and self._since_compaction >= self.compact_every
+            )
+        if start_compaction and not self._compact_lock.locked():
+            threading.Thread(target=self.compact, args=(False,), daemon=True).start()
+
+    def _write_pending(self):
+        # Called with self._cond held; releases it during the actual I/O
+        if self._broken is not None:
+            raise OSError(f"Journal is unusable after a failed write: {self._broken}")
+        self._flushing = True
+        lines, self._pending = self._pending, []
+        upto = self._seq
+        self._cond.release()
+        try:
+            self._write_journal(b"".join(lines))
+        except BaseException:
+            self._cond.acquire()
+            # Nothing of the batch is in the journal, queue it again ahead
+            # of the records added meanwhile so a later flush retries it
+            self._pending[:0] = lines
+            raise
+        else:
+            self._cond.acquire()
+            self._written = upto
+        finally:
+            self._flushing = False
+            self._cond.notify_all()
+
+    def _write_journal(self, data):
+        fd = self._journal.fileno()
+        end = os.lseek(fd, 0, os.SEEK_END)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+        except BaseException as error:
+            # Cut off whatever part of the batch did reach the file, so the
+            # retry cannot leave a torn or duplicated record behind
+            try:
+                os.ftruncate(fd, end)
+            except OSError:
+                self._broken = error
+            raise
+
+    # == Compaction ==
+
+    def compact(self, blocking=True):
+        """Fold the journal into the SQLite snapshot and start a new journal"""
+        if not self._compact_lock.acquire(blocking=blocking):
+            return
+        try:
+            with self._cond:
+                while self._flushing:
+                    self._cond.wait()
+                if self._pending:
+                    self._write_pending()
+                self._journal.close()
+                os.replace(self.journal_path, self.compacting_path)
+                self._journal = open(self.journal_path, "ab", buffering=0)
+                self._since_compaction = 0
+            self._apply_to_snapshot(self.compacting_path)
+            os.remove(self.compacting_path)
+        finally:
+            self._compact_lock.release()
+
+    def _apply_to_snapshot(self, journal_path):
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.executescript(SCHEMA)
+            last_seq = self._last_seq(conn)
+            with conn:
+                for record in _read_journal(journal_path):
+                    if record["seq"] <= last_seq:
+                        continue
+                    op = record["op"]
+                    if op == "order":
+                        order = record["order"]
+                        inserted = conn.execute(
+                            "INSERT OR IGNORE INTO orders "
+                            f"({', '.join(ORDER_COLUMNS)}) "
+                            f"VALUES ({', '.join('?' for _ in ORDER_COLUMNS)})",
+                            [order[c] for c in ORDER_COLUMNS],
+                        ).rowcount
+                        if inserted:
+                            conn.execute(
+                                "UPDATE products SET stock = stock - ? WHERE id = ?",
+                                (order["quantity"], order["product_id"]),
+                            )
+                        else:
+                            conn.execute(UPSERT_ORDER, [order[c] for c in ORDER_COLUMNS])
+                    elif op == "stock":
+                        conn.execute(
+                            "UPDATE products SET stock = ? WHERE id = ?",
+                            (record["stock"], record["product_id"]),
+                        )
+                    elif op == "product":
+                        product = record["product"]
+                        conn.execute(
+                            UPSERT_PRODUCT, [product.get(c) for c in PRODUCT_COLUMNS]
+                        )
+                    last_seq = record["seq"]
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('last_seq', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (last_seq,),
+                )
+        finally:
+            conn.close()
+
+    def close(self):
+        if self._journal is None:
+            return
+        self.flush()
+        self.compact(blocking=True)
+        self._journal.close()
+        self._journal = None
@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from analytics import SalesAnalytics  # noqa: E402
+from inventory import OrderIdGenerator  # noqa: E402
+from result_cache import StoreVersions  # noqa: E402
+from storage import MemoryStorage  # noqa: E402
+
+ORDERS_WITH_PRODUCT = "{ allOrders { id product { id name stock } } }"
+ORDERS_WITHOUT_PRODUCT = "{ allOrders { id productName } }"
+CREATE_ORDERS = """
+    mutation {
+      createOrders(
+        lines: [
+          {productId: "1", quantity: 1}
+          {productId: "2", quantity: 1}
+          {productId: "3", quantity: 1}
+        ]
+        customerName: "test"
+      ) { success orders { id product { id stock } } }
+    }
+"""
+
+
+class OrderProductLoaderTest(unittest.TestCase):
+    def setUp(self):
+        # Mutations write to throwaway storage, counters and indexes, so
+        # nothing reaches a real database or outlives the test
+        store_versions = StoreVersions("products", "orders")
+        for target, name, value in (
+            (app, "storage", MemoryStorage()),
+            (app, "analytics", SalesAnalytics()),
+            (app, "order_ids", OrderIdGenerator(start=1_000_000)),
+            (app, "order_index", app.OrderIndex(app.orders_db)),
+            (app, "store_versions", store_versions),
+            (app.result_cache, "versions", store_versions),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self._orders = list(app.orders_db)
+        self._orders_by_id = dict(app.orders_by_id)
+        self._stock = {p["id"]: p["stock"] for p in app.products_db}
+        app.result_cache.clear()
+
+    def tearDown(self):
+        app.orders_db[:] = self._orders
+        app.orders_by_id.clear()
+        app.orders_by_id.update(self._orders_by_id)
+        for product_id, stock in self._stock.items():
+            app.products_by_id[product_id]["stock"] = stock
+        app.result_cache.clear()
+
+    def add_orders(self, count):
+        product_ids = [p["id"] for p in app.products_db]
+        for i in range(count):
+            product = app.products_by_id[product_ids[i % len(product_ids)]]
+            order = {
+                "id": f"test-{i}",
+                "product_id": product["id"],
+                "product_name": product["name"],
+                "quantity": 1,
+                "total_price": product["price"],
+                "customer_name": "test",
+                "status": "PENDING",
+                "created_at": "2024-01-01T00:00:00",
+            }
+            app.orders_db.append(order)
+            app.order_index.add(len(app.orders_db) - 1, order)
+            app.orders_by_id[order["id"]] = order
+
+    def execute(self, query):
+        context = app.create_context()
+        result = app.execute_operation(query, context=context)
+        self.assertIsNone(result.errors)
+        return result, context["product_loader"]
+
+    def test_all_orders_fetch_products_in_one_batch(self):
+        self.add_orders(10_000)
+        result, loader = self.execute(ORDERS_WITH_PRODUCT)
+        self.assertEqual(loader.batch_calls, 1)
+        self.assertGreaterEqual(len(result.data["allOrders"]), 10_000)
+        self.assertTrue(all(order["product"] for order in result.data["allOrders"]))
+
+    def test_no_fetch_when_product_not_selected(self):
+        self.add_orders(10_000)
+        _, loader = self.execute(ORDERS_WITHOUT_PRODUCT)
+        self.assertEqual(loader.batch_calls, 0)
+
+    def test_create_orders_fetches_products_in_one_batch(self):
+        for product_id in ("1", "2", "3"):
+            app.products_by_id[product_id]["stock"] = 10
+        result, loader = self.execute(CREATE_ORDERS)
+        self.assertTrue(result.data["createOrders"]["success"])
+        self.assertEqual(loader.batch_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+
+PRODUCT = {
+    "id": "1",
+    "name": "Laptop",
+    "price": 100,
+    "stock": 10,
+    "category": "Electronics",
+    "description": "",
+}
+ORDER = {
+    "id": "1",
+    "product_id": "1",
+    "product_name": "Laptop",
+    "quantity": 2,
+    "total_price": 200,
+    "customer_name": "test",
+    "status": "PENDING",
+    "created_at": "2024-01-01T00:00:00",
+}
+
+
+def disk_full(*args):
+    raise OSError(errno.ENOSPC, "No space left on device")
+
+
+class JournalWriteFailureTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "shop.db")
+        self.storage = storage.SQLiteStorage(self.path, [PRODUCT])
+        self.products, _ = self.storage.load()
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.directory)
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = storage.SQLiteStorage(self.path)
+        return self.storage.load()
+
+    def test_failed_write_is_retried_by_the_next_sync(self):
+        with mock.patch("storage.os.write", disk_full):
+            self.storage.record_order(ORDER)
+            with self.assertRaises(OSError):
+                self.storage.sync()
+        self.products[0]["stock"] = 50
+        self.storage.record_stock(self.products[0])
+        self.storage.sync()
+
+        products, orders = self.reopen()
+        self.assertEqual([o["id"] for o in orders], ["1"])
+        self.assertEqual(products[0]["stock"], 50)
+
+    def test_partial_write_is_not_left_in_the_journal(self):
+        write = os.write
+
+        def write_half_then_fail(fd, data):
+            write(fd, bytes(data[: len(data) // 2]))
+            disk_full()
+
+        with mock.patch("storage.os.write", write_half_then_fail):
+            self.storage.record_order(ORDER)
+            with self.assertRaises(OSError):
+                self.storage.sync()
+        self.storage.sync()
+
+        products, orders = self.reopen()
+        self.assertEqual([o["id"] for o in orders], ["1"])
+        self.assertEqual(products[0]["stock"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from inspect import isawaitable
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+
+class FieldLatencyHistograms:
+    """Per-field resolver latency histograms, exported in Prometheus format"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._fields = {}  # "Type.field" -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, key, seconds):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            row = self._fields.get(key)
+            if row is None:
+                row = self._fields[key] = [0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += seconds
+
+    def render_prometheus(self):
+        name = "graphql_resolver_duration_seconds"
+        lines = [
+            f"# HELP {name} GraphQL resolver latency by field",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            rows = sorted((key, list(row)) for key, row in self._fields.items())
+        for key, row in rows:
+            parent_type, field_name = key.split(".", 1)
+            labels = f'type="{parent_type}",field="{field_name}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += row[len(self.buckets)]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {row[-1]}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+class Tracer:
+    """Apollo-tracing compatible timings for one operation
+
+    Used as graphql-core middleware, so it only costs anything for the
+    requests that are traced; untraced requests run without it.
+    """
+
+    def __init__(self, histograms=None):
+        self.histograms = histograms
+        self.start_time = datetime.now(timezone.utc)
+        self._start = time.perf_counter_ns()
+        self.parsing = None
+        self.validation = None
+        self.resolvers = []
+
+    def offset(self):
+        return time.perf_counter_ns() - self._start
+
+    def phase(self, start_offset, end_offset):
+        return {"startOffset": start_offset, "duration": end_offset - start_offset}
+
+    def _record(self, info, start_offset):
+        duration = self.offset() - start_offset
+        self.resolvers.append(
+            {
+                "path": info.path.as_list(),
+                "parentType": info.parent_type.name,
+                "fieldName": info.field_name,
+                "returnType": str(info.return_type),
+                "startOffset": start_offset,
+                "duration": duration,
+            }
+        )
+        if self.histograms is not None:
+            self.histograms.observe(f"{info.parent_type.name}.{info.field_name}", duration / 1e9)
+
+    def resolve(self, next_, root, info, **args):
+        start_offset = self.offset()
+        result = next_(root, info, **args)
+        if isawaitable(result):
+            return self._await_and_record(result, info, start_offset)
+        self._record(info, start_offset)
+        return result
+
+    async def _await_and_record(self, result, info, start_offset):
+        try:
+            return await result
+        finally:
+            self._record(info, start_offset)
+
+    def finish(self):
+        duration = self.offset()
+        end_time = datetime.now(timezone.utc)
+        tracing = {
+            "version": 1,
+            "startTime": self.start_time.isoformat().replace("+00:00", "Z"),
+            "endTime": end_time.isoformat().replace("+00:00", "Z"),
+            "duration": duration,
+            "execution": {"resolvers": self.resolvers},
+        }
+        if self.parsing is not None:
+            tracing["parsing"] = self.parsing
+        if self.validation is not None:
+            tracing["validation"] = self.validation
+        return tracing
+
+
+def should_trace(extensions, sample_rate):
+    """Trace when the client asks for it or the request is sampled"""
+    if isinstance(extensions, dict) and extensions.get("tracing"):
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
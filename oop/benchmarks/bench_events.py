@@ -0,0 +1,111 @@
+"""Events/sec for each vehicle event sink, and memory per Car
+
+The print baselines write the old per-call messages to os.devnull, which
+measures formatting and write calls without terminal rendering, and to a
+file, which like the batched file sink keeps the events. Rates are
+the median of --runs runs, with the cases interleaved.
+
+Memory is measured for the printing Car, a dict-based Car with the same
+attributes as the slotted one (so the difference is what ``__slots__``
+saves) and the slotted Car, which also carries a vehicle id and a sink.
+
+    python benchmarks/bench_events.py --events 1000000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import BatchedFileSink, NullSink, RingBufferSink  # noqa: E402
+from vehicle_example import Car, Vehicle, reserve_vehicle_ids  # noqa: E402
+
+
+class PrintingCar:
+    """The previous dict-based Car, printing on every state change"""
+
+    def __init__(self, brand, model, fuel_type, out):
+        self.brand = brand
+        self.model = model
+        self.fuel_type = fuel_type
+        self._speed = 0
+        self.out = out
+
+    def accelerate(self, increment):
+        self._speed += increment
+        print(f"{self.brand} is now going at {self._speed} km/h", file=self.out)
+
+
+class DictCar:
+    """The attributes of the slotted Car, kept in an instance dict"""
+
+    def __init__(self, brand, model, fuel_type, sink=None):
+        self.vehicle_id = reserve_vehicle_ids(1)
+        self.brand = brand
+        self.model = model
+        self._speed = 0
+        self.sink = sink if sink is not None else Vehicle.default_sink
+        self.fuel_type = fuel_type
+
+
+def events_per_sec(car, count):
+    accelerate = car.accelerate
+    start = time.perf_counter()
+    for _ in range(count):
+        accelerate(1)
+    return count / (time.perf_counter() - start)
+
+
+def bytes_per_instance(make, count=100_000):
+    tracemalloc.start()
+    instances = [make() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        print_file = open(os.path.join(tmp, "events.log"), "w")
+        file_sink = BatchedFileSink(os.path.join(tmp, "events.bin"), args.batch_size)
+        cases = [
+            ("print devnull", PrintingCar("Toyota", "Camry", "Petrol", devnull)),
+            ("print file", PrintingCar("Toyota", "Camry", "Petrol", print_file)),
+            ("null", Car("Toyota", "Camry", "Petrol", sink=NullSink())),
+            ("ring buffer", Car("Toyota", "Camry", "Petrol", sink=RingBufferSink(100_000))),
+            ("batched file", Car("Toyota", "Camry", "Petrol", sink=file_sink)),
+        ]
+        rates = {name: [] for name, _ in cases}
+        for _ in range(args.runs):
+            for name, car in cases:
+                rates[name].append(events_per_sec(car, args.events))
+        for name, _ in cases:
+            print(
+                f"{name:13} {statistics.median(rates[name]):12.0f} events/sec "
+                f"(median of {args.runs}, min {min(rates[name]):.0f}, max {max(rates[name]):.0f})"
+            )
+        file_sink.close()
+        print_file.close()
+
+    with open(os.devnull, "w") as devnull:
+        for name, make in (
+            ("printing Car", lambda: PrintingCar("Toyota", "Camry", "Petrol", devnull)),
+            ("dict Car", lambda: DictCar("Toyota", "Camry", "Petrol")),
+            ("slotted Car", lambda: Car("Toyota", "Camry", "Petrol")),
+        ):
+            print(f"{name:13} {bytes_per_instance(make):12.1f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main()
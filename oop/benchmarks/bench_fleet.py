@@ -0,0 +1,83 @@
+"""Fleet ticks against per-object Car updates
+
+    python benchmarks/bench_fleet.py --vehicles 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from fleet import Fleet  # noqa: E402
+from vehicle_example import Car  # noqa: E402
+
+BRANDS = ["Toyota", "Honda", "Tesla", "BMW", "Hyundai", "Suzuki"]
+MODELS = ["Camry", "Civic", "Model 3", "X5", "Ioniq", "Swift", "Corolla", "Jazz"]
+FUELS = ["Petrol", "Diesel", "Electric", "Hybrid"]
+
+
+def random_fleet(size, seed=0):
+    rng = np.random.default_rng(seed)
+    fleet = Fleet(
+        np.array(BRANDS)[rng.integers(len(BRANDS), size=size)],
+        np.array(MODELS)[rng.integers(len(MODELS), size=size)],
+        np.array(FUELS)[rng.integers(len(FUELS), size=size)],
+    )
+    fleet.set_acceleration(rng.uniform(-3.0, 3.0, size=size))
+    return fleet
+
+
+def per_second(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return repeats / (time.perf_counter() - start)
+
+
+def report(engine, name, rate, vehicles):
+    return f"{engine:7} {name:16} {rate:10.1f} ops/sec  {rate * vehicles:14.0f} vehicle updates/sec"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vehicles", type=int, default=1_000_000)
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument(
+        "--objects", type=int, default=10_000, help="size of the per-object baseline"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    fleet = random_fleet(args.vehicles)
+    print(f"built fleet of {args.vehicles} in {time.perf_counter() - start:.2f}s")
+
+    half = np.arange(0, args.vehicles, 2)
+    slow = fleet.speed < 10
+    # (name, operation, vehicles it updates)
+    cases = [
+        ("tick", fleet.tick, args.vehicles),
+        ("accelerate all", lambda: fleet.accelerate(1.0), args.vehicles),
+        ("accelerate mask", lambda: fleet.accelerate(1.0, slow), int(slow.sum())),
+        ("accelerate half", lambda: fleet.accelerate(1.0, half), len(half)),
+        ("stop half", lambda: fleet.stop(half), len(half)),
+    ]
+    for name, fn, updated in cases:
+        rate = per_second(fn, args.ticks)
+        print(report("fleet", name, rate, updated))
+
+    # Baseline: one accelerate() call per Car, events go to the null sink
+    cars = [Car(BRANDS[i % 6], MODELS[i % 8], FUELS[i % 4]) for i in range(args.objects)]
+
+    def accelerate_each():
+        for car in cars:
+            car.accelerate(1)
+
+    rate = per_second(accelerate_each, 3)
+    print(report("objects", "accelerate each", rate, args.objects))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import struct
+import time
+from collections import deque, namedtuple
+
+VehicleEvent = namedtuple("VehicleEvent", ["vehicle_id", "event_type", "speed", "timestamp"])
+
+ENGINE_STARTED = "engine_started"
+ACCELERATED = "accelerated"
+STOPPED = "stopped"
+
+EVENT_TYPES = (ENGINE_STARTED, ACCELERATED, STOPPED)
+_EVENT_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+
+# vehicle id, event type code, speed, timestamp
+RECORD = struct.Struct("<qBdd")
+
+
+class NullSink:
+    """Drops every event; the cheapest sink when nobody is listening"""
+
+    __slots__ = ()
+
+    def emit(self, vehicle_id, event_type, speed):
+        pass
+
+    def close(self):
+        pass
+
+
+class RingBufferSink:
+    """Keeps the last ``capacity`` events in memory, dropping the oldest"""
+
+    __slots__ = ("_events", "dropped")
+
+    def __init__(self, capacity=10_000):
+        self._events = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def emit(self, vehicle_id, event_type, speed):
+        events = self._events
+        if len(events) == events.maxlen:
+            self.dropped += 1
+        events.append((vehicle_id, event_type, speed, time.time()))
+
+    def events(self):
+        # Plain tuples are stored, named only when read back
+        return [VehicleEvent._make(event) for event in self._events]
+
+    def __len__(self):
+        return len(self._events)
+
+    def clear(self):
+        self._events.clear()
+
+    def close(self):
+        pass
+
+
+class BatchedFileSink:
+    """Writes events to a binary file, one write per ``batch_size`` events
+
+    Each event is packed straight into a preallocated buffer as a fixed
+    size ``RECORD`` (no per-event text formatting), and the buffer goes
+    to the file in a single write when full. Vehicle ids must be integers.
+    Call ``close()`` (or use it as a context manager) to write the last
+    partial batch; ``read_events()`` decodes the file.
+    """
+
+    __slots__ = ("batch_size", "_file", "_buffer", "_offset", "_pack")
+
+    def __init__(self, path, batch_size=4096):
+        self.batch_size = batch_size
+        self._file = open(path, "wb")
+        self._buffer = bytearray(RECORD.size * batch_size)
+        self._offset = 0
+        self._pack = RECORD.pack_into
+
+    def emit(self, vehicle_id, event_type, speed):
+        self._pack(
+            self._buffer, self._offset, vehicle_id, _EVENT_CODES[event_type], speed, time.time()
+        )
+        self._offset += RECORD.size
+        if self._offset == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._offset:
+            self._file.write(memoryview(self._buffer)[: self._offset])
+            self._offset = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_events(path):
+    """Yield the VehicleEvents written by a BatchedFileSink"""
+    with open(path, "rb") as f:
+        data = f.read()
+    for vehicle_id, code, speed, timestamp in RECORD.iter_unpack(data):
+        yield VehicleEvent(vehicle_id, EVENT_TYPES[code], speed, timestamp)
@@ -0,0 +1,160 @@
+import operator
+
+import numpy as np
+
+from vehicle_example import Car, Vehicle, reserve_vehicle_ids
+
+
+def _intern(values):
+    """Return (names, codes) with codes indexing into the names list"""
+    names, codes = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+    return names.tolist(), codes.astype(np.int32)
+
+
+class FleetCar(Car):
+    """A Car backed by one row of a Fleet
+
+    Reads and writes go straight to the fleet's arrays, so the inherited
+    Vehicle methods (accelerate, stop, get_speed, ...) work unchanged and
+    emit their events to the fleet's sink.
+    """
+
+    __slots__ = ("_fleet", "_index")
+
+    def __init__(self, fleet, index):
+        # Car.__init__ is skipped on purpose, the data lives in the fleet
+        self._fleet = fleet
+        self._index = index
+
+    @property
+    def vehicle_id(self):
+        return self._fleet.first_vehicle_id + self._index
+
+    @property
+    def sink(self):
+        return self._fleet.sink
+
+    @property
+    def brand(self):
+        return self._fleet.brand_names[self._fleet.brand_codes[self._index]]
+
+    @property
+    def model(self):
+        return self._fleet.model_names[self._fleet.model_codes[self._index]]
+
+    @property
+    def fuel_type(self):
+        return self._fleet.fuel_names[self._fleet.fuel_codes[self._index]]
+
+    @property
+    def _speed(self):
+        return self._fleet.speed[self._index].item()
+
+    @_speed.setter
+    def _speed(self, value):
+        self._fleet.speed[self._index] = value
+
+
+class Fleet:
+    """Struct-of-arrays simulation of many cars
+
+    Brand, model and fuel type are interned to int32 codes and speed,
+    acceleration and odometer are float64 arrays, so batched accelerate
+    and stop calls and every tick are single vectorized operations.
+    ``which`` selects vehicles by index array or boolean mask, ``None``
+    means the whole fleet. ``fleet[i]`` returns a Car-compatible view.
+    Batched operations emit no events, only the per-vehicle views do.
+    Each fleet reserves a block of vehicle ids from the sequence standalone
+    vehicles use, so events in a shared sink never mix up two vehicles.
+    """
+
+    def __init__(self, brands, models, fuel_types, max_speed=200.0, sink=None):
+        self.brand_names, self.brand_codes = _intern(brands)
+        self.model_names, self.model_codes = _intern(models)
+        self.fuel_names, self.fuel_codes = _intern(fuel_types)
+        size = len(self.brand_codes)
+        if not len(self.model_codes) == len(self.fuel_codes) == size:
+            raise ValueError("brands, models and fuel_types must have the same length")
+
+        self.first_vehicle_id = reserve_vehicle_ids(size)
+        self.max_speed = max_speed
+        self.sink = sink if sink is not None else Vehicle.default_sink
+        self.speed = np.zeros(size)  # km/h
+        self.acceleration = np.zeros(size)  # km/h per second, applied by tick()
+        self.odometer = np.zeros(size)  # km
+        self._scratch = np.empty(size)
+
+    @classmethod
+    def from_cars(cls, cars, **kwargs):
+        cars = list(cars)
+        fleet = cls(
+            [car.brand for car in cars],
+            [car.model for car in cars],
+            [getattr(car, "fuel_type", "") for car in cars],
+            **kwargs,
+        )
+        fleet.speed[:] = [car.get_speed() for car in cars]
+        return fleet
+
+    def __len__(self):
+        return len(self.speed)
+
+    def __getitem__(self, index):
+        index = operator.index(index)
+        if not -len(self) <= index < len(self):
+            raise IndexError("fleet index out of range")
+        return FleetCar(self, index % len(self))
+
+    def __iter__(self):
+        return (FleetCar(self, index) for index in range(len(self)))
+
+    def accelerate(self, increment, which=None):
+        """Add increment (scalar or per-vehicle array) to the speed"""
+        if which is None:
+            self.speed += increment
+        elif np.asarray(which).dtype == bool:
+            self.speed[which] += increment
+        else:
+            # add.at so a vehicle listed twice accelerates twice
+            np.add.at(self.speed, which, increment)
+
+    def stop(self, which=None):
+        selected = slice(None) if which is None else which
+        self.speed[selected] = 0.0
+        self.acceleration[selected] = 0.0
+
+    def set_acceleration(self, rate, which=None):
+        self.acceleration[slice(None) if which is None else which] = rate
+
+    def tick(self, seconds=1.0):
+        """Advance the simulation: apply acceleration, clamp, move"""
+        scratch = self._scratch
+        np.multiply(self.acceleration, seconds, out=scratch)
+        self.speed += scratch
+        np.clip(self.speed, 0.0, self.max_speed, out=self.speed)
+        np.multiply(self.speed, seconds / 3600.0, out=scratch)
+        self.odometer += scratch
+
+    def get_speeds(self):
+        return self.speed.copy()
+
+    def moving(self):
+        """Indexes of the vehicles that are not standing still"""
+        return np.flatnonzero(self.speed)
+
+
+if __name__ == "__main__":
+    fleet = Fleet(
+        ["Toyota", "Honda", "Tesla"],
+        ["Camry", "Civic", "Model 3"],
+        ["Petrol", "Petrol", "Electric"],
+    )
+    fleet.accelerate(30)
+    fleet.set_acceleration(2.5, which=[2])
+    for _ in range(10):
+        fleet.tick()
+    car = fleet[2]
+    car.show_info()
+    print("Current speed:", car.get_speed())
+    fleet.stop(fleet.speed > 40)
+    print("Moving:", [fleet[i].brand for i in fleet.moving()])
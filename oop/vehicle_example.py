@@ -1,36 +1,66 @@
+import itertools
+
+from events import ACCELERATED, ENGINE_STARTED, STOPPED, NullSink, RingBufferSink
+
+_vehicle_ids = itertools.count(1)
+
+
+def reserve_vehicle_ids(count):
+    """Take ``count`` consecutive vehicle ids and return the first one
+
+    Draining a slice of the shared ``itertools.count`` runs entirely in C
+    under the GIL, so no other vehicle gets an id inside the block.
+    """
+    return max(itertools.islice(_vehicle_ids, count), default=0) - count + 1
+
+
 class Vehicle:
-    def __init__(self, brand, model):
+    # No per-instance __dict__: about 50 bytes less than the same attributes
+    # in a dict, though the id and sink slots use most of that up again
+    __slots__ = ("vehicle_id", "brand", "model", "_speed", "sink")
+
+    # Used when no sink is given; events are dropped unless this is replaced
+    default_sink = NullSink()
+
+    def __init__(self, brand, model, sink=None, vehicle_id=None):
+        self.vehicle_id = next(_vehicle_ids) if vehicle_id is None else vehicle_id
         self.brand = brand
         self.model = model
         self._speed = 0
-    
+        self.sink = sink if sink is not None else self.default_sink
+
     def start_engine(self):
-        print(f"{self.brand} {self.model} engine started.")
+        self.sink.emit(self.vehicle_id, ENGINE_STARTED, self._speed)
 
     def accelerate(self, increment):
         self._speed += increment
-        print(f"{self.brand} is now going at {self._speed} km/h")
-    
+        self.sink.emit(self.vehicle_id, ACCELERATED, self._speed)
+
     def stop(self):
         self._speed = 0
-        print(f"{self.brand} has stopped.")
-        
+        self.sink.emit(self.vehicle_id, STOPPED, 0)
+
     def get_speed(self):
         return self._speed
-    
+
 class Car(Vehicle):
-    def __init__(self, brand, model, fuel_type):
-        super().__init__(brand, model)
+    __slots__ = ("fuel_type",)
+
+    def __init__(self, brand, model, fuel_type, sink=None, vehicle_id=None):
+        super().__init__(brand, model, sink, vehicle_id)
         self.fuel_type = fuel_type
-    
+
     def show_info(self):
         print(f"Car: {self.brand} {self.model}, Fuel: {self.fuel_type}")
 
 if __name__ == "__main__":
-    car1 = Car("Toyota", "Camry", "Petrol")
+    events = RingBufferSink(capacity=100)
+    car1 = Car("Toyota", "Camry", "Petrol", sink=events)
     car1.show_info()
     car1.start_engine()
     car1.accelerate(30)
     car1.accelerate(20)
     print("Current speed:", car1.get_speed())
     car1.stop()
+    for event in events.events():
+        print(event)